@@ -1,3 +1,34 @@
 from django.contrib import admin
 
-# Register your models here.
+
+class DeletedListFilter(admin.SimpleListFilter):
+    """
+    Soft-deleted rows (waiting for the background purge) are hidden from a
+    changelist unless asked for.
+    """
+    title = "deleted"
+    parameter_name = "deleted"
+
+    def lookups(self, request, model_admin):
+        return (("yes", "Yes"), ("all", "All"))
+
+    def queryset(self, request, queryset):
+        if self.value() == "yes":
+            return queryset.filter(deleted_at__isnull=False)
+        if self.value() == "all":
+            return queryset
+        return queryset.filter(deleted_at__isnull=True)
+
+    def choices(self, changelist):
+        # No value means live rows only, so the default choice reads "No".
+        yield {
+            "selected": self.value() is None,
+            "query_string": changelist.get_query_string(remove=[self.parameter_name]),
+            "display": "No",
+        }
+        for lookup, title in self.lookup_choices:
+            yield {
+                "selected": self.value() == lookup,
+                "query_string": changelist.get_query_string({self.parameter_name: lookup}),
+                "display": title,
+            }
@@ -0,0 +1,143 @@
+"""
+Async versions of the hottest read endpoints, served under /api/async/ when
+the app runs on ASGI.
+
+They return the same payloads as their DRF counterparts and reuse the same
+querysets, filters and serializers; only the I/O is awaited. Under ASGI every
+request gets its own thread for the async ORM, so a worker keeps serving other
+requests while one waits on the database.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage, Paginator as DjangoPaginator
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_safe
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from dashboard.views import user_events_queryset, user_dashboard_payload
+from events import reaction_index
+from events.views import EventViewSet
+from overview.snapshot import aget_snapshot
+from overview.views import _etag_matches, OVERVIEW_MAX_AGE, OVERVIEW_STALE_WHILE_REVALIDATE
+from .renderers import FastJSONRenderer
+
+
+def _json(data, status=200):
+    return HttpResponse(FastJSONRenderer().render(data), status=status, content_type="application/json")
+
+
+def async_api_view(view):
+    """Turn DRF exceptions raised by an async view into the usual JSON errors."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            return await view(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+            response = _json(detail, exc.status_code)
+            if getattr(exc, "wait", None):
+                response["Retry-After"] = "%d" % exc.wait
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                response.status_code = 401
+                authenticator = api_settings.DEFAULT_AUTHENTICATION_CLASSES[0]()
+                response["WWW-Authenticate"] = authenticator.authenticate_header(request)
+            return response
+    return wrapper
+
+
+async def _authenticate(request):
+    """Wrap the request for DRF and resolve its user on the request's DB thread."""
+    drf_request = Request(
+        request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    )
+    await sync_to_async(lambda: drf_request.user)()
+    return drf_request
+
+
+async def _event_view(request, action, **kwargs):
+    view = EventViewSet(action=action, action_map={"get": action}, args=(), kwargs=kwargs, format_kwarg=None)
+    view.request = await _authenticate(request)
+    view.check_permissions(view.request)
+    return view
+
+
+async def _serializer_context(view):
+    """The view's serializer context with the caller's reaction map loaded up front."""
+    context = view.get_serializer_context()
+    if view.request.user.is_authenticated:
+        context["reaction_statuses"] = await sync_to_async(reaction_index.statuses_for)(view.request.user.pk)
+    return context
+
+
+@require_safe
+@async_api_view
+async def event_list(request):
+    """GET /api/async/events/ — same filters, search and pagination as /api/events/."""
+    view = await _event_view(request, "list")
+    queryset = view.filter_queryset(view.get_queryset())
+
+    pagination = view.paginator
+    paginator = DjangoPaginator(queryset, pagination.get_page_size(view.request))
+    paginator.count = await queryset.acount()
+    page_number = pagination.get_page_number(view.request, paginator)
+    try:
+        page = paginator.page(page_number)
+    except InvalidPage as exc:
+        raise exceptions.NotFound(
+            pagination.invalid_page_message.format(page_number=page_number, message=str(exc))
+        )
+    page.object_list = [event async for event in page.object_list]
+
+    pagination.page = page
+    pagination.request = view.request
+    data = view.get_serializer(page.object_list, many=True, context=await _serializer_context(view)).data
+    return _json(pagination.get_paginated_response(data).data)
+
+
+@require_safe
+@async_api_view
+async def event_detail(request, pk):
+    """GET /api/async/events/{id}/"""
+    view = await _event_view(request, "retrieve", pk=pk)
+    event = await view.filter_queryset(view.get_queryset()).filter(pk=pk).afirst()
+    if event is None:
+        raise exceptions.NotFound("No Event matches the given query.")
+    view.check_object_permissions(view.request, event)
+    return _json(view.get_serializer(event, context=await _serializer_context(view)).data)
+
+
+@require_safe
+@async_api_view
+async def user_dashboard(request):
+    """GET /api/async/dashboard/user/"""
+    drf_request = await _authenticate(request)
+    if not drf_request.user.is_authenticated:
+        raise exceptions.NotAuthenticated()
+    user_events = [event async for event in user_events_queryset(drf_request.user)]
+    statuses = await sync_to_async(reaction_index.statuses_for)(drf_request.user.pk)
+    return _json(user_dashboard_payload(user_events, drf_request, statuses))
+
+
+@require_safe
+@async_api_view
+async def overview(request):
+    """GET /api/async/overview/"""
+    snapshot = await aget_snapshot()
+
+    if _etag_matches(request, snapshot["etag"]):
+        response = HttpResponse(status=304)
+    else:
+        response = _json(snapshot["payload"])
+
+    response["ETag"] = snapshot["etag"]
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=OVERVIEW_MAX_AGE,
+        stale_while_revalidate=OVERVIEW_STALE_WHILE_REVALIDATE,
+    )
+    return response
@@ -0,0 +1,58 @@
+"""
+Running independent database work concurrently.
+
+Django's async ORM runs every query of a request on that request's single
+thread, so ``asyncio.gather`` over ``acount()`` calls still executes them one
+after another. To overlap independent queries (dashboard aggregates and the
+like) they are submitted to a shared thread pool; each pool thread keeps its
+own connection, which is released according to CONN_MAX_AGE after every task,
+just like at the end of a request. CONN_MAX_AGE must be non-zero for this to
+pay off: the pool's connections then stay open between dashboard requests
+instead of being opened for every task.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+_executor = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.DB_THREAD_POOL_SIZE, thread_name_prefix="db-pool"
+                )
+    return _executor
+
+
+def _run(fn):
+    _local.in_pool = True
+    try:
+        return fn()
+    finally:
+        _local.in_pool = False
+        close_old_connections()
+
+
+def parallel(**tasks):
+    """
+    Run the given callables concurrently and return {name: result}.
+
+    Each callable runs on its own connection, outside the caller's transaction.
+    Inside an atomic block (including a TestCase) the tasks run inline instead,
+    so they see the caller's uncommitted writes. Called from a pool thread, the
+    tasks run inline too, so nested use can't deadlock.
+    """
+    if getattr(_local, "in_pool", False) or connection.in_atomic_block or len(tasks) < 2:
+        return {name: fn() for name, fn in tasks.items()}
+    executor = _get_executor()
+    futures = {name: executor.submit(_run, fn) for name, fn in tasks.items()}
+    return {name: future.result() for name, future in futures.items()}
+
@@ -0,0 +1,103 @@
+"""
+`Idempotency-Key` support for retried POSTs.
+
+A view method wrapped in `idempotent` runs, for requests carrying the header,
+inside one transaction together with the insert of the key row. A retry with
+the same key finds the committed row and gets the stored response replayed
+without the view running again; a concurrent duplicate blocks on the unique
+index until the first transaction ends, then replays (or, if the first one
+failed and rolled back, does the work itself). Only successful responses are
+stored, so a failed attempt can simply be retried.
+"""
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.timezone import now
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+BATCH_SIZE = 1000
+
+
+def _fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def _claim(user_id, key, endpoint, fingerprint):
+    """Insert the key row; returns its id, or None if it already exists."""
+    table = connection.ops.quote_name(IdempotencyKey._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} ("user_id", "key", "endpoint", "fingerprint", "created_at") '
+            'VALUES (%s, %s, %s, %s, %s) ON CONFLICT DO NOTHING RETURNING "id"',
+            [user_id, key, endpoint, fingerprint, now()],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _replay(stored, fingerprint):
+    if stored.fingerprint != fingerprint:
+        return Response(
+            {"detail": f"{HEADER} was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return Response(stored.response_body, status=stored.status_code, headers={"Idempotent-Replayed": "true"})
+
+
+def idempotent(view):
+    """Decorate a ViewSet/APIView handler (POST) to honour `Idempotency-Key`."""
+    @wraps(view)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None or not request.user.is_authenticated:
+            return view(self, request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"detail": f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        endpoint = f"{request.method} {request.path}"[:255]
+        fingerprint = _fingerprint(request)
+        lookup = IdempotencyKey.objects.filter(user=request.user, key=key, endpoint=endpoint)
+        with transaction.atomic():
+            claimed = _claim(request.user.pk, key, endpoint, fingerprint)
+            if claimed is None:
+                stored = lookup.first()
+                if stored is not None and stored.created_at >= now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL):
+                    return _replay(stored, fingerprint)
+                # Expired (or purged meanwhile): the key is free again.
+                lookup.delete()
+                claimed = _claim(request.user.pk, key, endpoint, fingerprint)
+
+            response = view(self, request, *args, **kwargs)
+            if not status.is_success(response.status_code):
+                # Drop the key along with any partial work; the client may retry.
+                transaction.set_rollback(True)
+                return response
+            IdempotencyKey.objects.filter(pk=claimed).update(
+                status_code=response.status_code, response_body=response.data
+            )
+        return response
+    return wrapper
+
+
+def purge_expired(batch_size=BATCH_SIZE):
+    """Delete keys past IDEMPOTENCY_KEY_TTL in batches; returns the number deleted."""
+    cutoff = now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+    deleted = 0
+    while True:
+        ids = list(IdempotencyKey.objects.filter(created_at__lt=cutoff).values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
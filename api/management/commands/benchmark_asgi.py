@@ -0,0 +1,144 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.asgi import get_asgi_application
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.management.loadgen import add_query_delay, percentile, wsgi_request
+from events.models import Event
+from users.models import User
+
+ENDPOINTS = ("events", "event", "dashboard", "overview")
+
+
+def _paths(endpoint, event_id):
+    return {
+        "events": ("/api/events/", "/api/async/events/"),
+        "event": (f"/api/events/{event_id}/", f"/api/async/events/{event_id}/"),
+        "dashboard": ("/api/dashboard/user/", "/api/async/dashboard/user/"),
+        "overview": ("/api/overview/", "/api/async/overview/"),
+    }[endpoint]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput and tail latency of the sync (WSGI) endpoints with their "
+        "async (ASGI) versions under concurrent load, in-process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("endpoints", nargs="*", help=f"Any of {', '.join(ENDPOINTS)} (default: all).")
+        parser.add_argument("--requests", type=int, default=400, help="Requests per run.")
+        parser.add_argument("--concurrency", type=int, default=50, help="Clients in flight at once.")
+        parser.add_argument(
+            "--wsgi-threads", type=int, default=1,
+            help="Requests the WSGI side serves at once (1 = one sync worker).",
+        )
+        parser.add_argument(
+            "--query-delay", type=float, default=0.0,
+            help="Milliseconds added to every query, to stand in for a remote database.",
+        )
+
+    def handle(self, *args, **options):
+        endpoints = options["endpoints"] or ENDPOINTS
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+
+        user = User.objects.filter(is_active=True).order_by("id").first()
+        event = Event.objects.order_by("-id").first()
+        if user is None or event is None:
+            raise CommandError("Needs at least one active user and one event.")
+        self.auth = f"JWT {AccessToken.for_user(user)}"
+
+        if options["query_delay"]:
+            add_query_delay(options["query_delay"])
+
+        self.wsgi = WSGIHandler()
+        self.asgi = get_asgi_application()
+        for endpoint in endpoints:
+            sync_path, async_path = _paths(endpoint, event.pk)
+            for label, path, run in (("wsgi", sync_path, self.run_wsgi), ("asgi", async_path, self.run_asgi)):
+                latencies, errors, elapsed = asyncio.run(run(path, options))
+                self.report(endpoint, label, latencies, errors, elapsed)
+
+    def report(self, endpoint, label, latencies, errors, elapsed):
+        latencies.sort()
+
+        self.stdout.write(
+            f"{endpoint:<10} {label}: {len(latencies) / elapsed:8.1f} req/s  "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p95 {percentile(latencies, 0.95) * 1000:7.1f} ms  "
+            f"p99 {percentile(latencies, 0.99) * 1000:7.1f} ms  errors {errors}"
+        )
+
+    async def _load(self, call, options):
+        remaining = options["requests"]
+        latencies = []
+        errors = 0
+
+        async def client():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                status = await call()
+                latencies.append(time.perf_counter() - started)
+                if status >= 400:
+                    errors += 1
+
+        await call()  # warm-up
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(options["concurrency"])))
+        return latencies, errors, time.perf_counter() - started
+
+    async def run_wsgi(self, path, options):
+        pool = ThreadPoolExecutor(max_workers=options["wsgi_threads"])
+        loop = asyncio.get_running_loop()
+
+        def request():
+            return wsgi_request(self.wsgi, path, headers={"Authorization": self.auth})
+
+        try:
+            return await self._load(lambda: loop.run_in_executor(pool, request), options)
+        finally:
+            pool.shutdown()
+
+    async def run_asgi(self, path, options):
+        async def request():
+            status = []
+            requested = False
+
+            async def receive():
+                nonlocal requested
+                if not requested:
+                    requested = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                # The client never goes away; Django stops listening once it has responded.
+                await asyncio.Event().wait()
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": b"",
+                "root_path": "",
+                "headers": [(b"host", b"127.0.0.1"), (b"authorization", self.auth.encode())],
+                "client": ("127.0.0.1", 0),
+                "server": ("127.0.0.1", 80),
+            }
+            await self.asgi(scope, receive, send)
+            return status[0]
+
+        return await self._load(request, options)
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import middleware
+from events.models import Event
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Bytes on the wire and CPU time per response for gzip and brotli on "
+        "representative API payloads, using the settings of CompressionMiddleware."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200, help="Compressions timed per payload.")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(is_active=True).order_by("id").first()
+        event = Event.objects.order_by("-id").first()
+        if user is None or event is None:
+            raise CommandError("Needs at least one active user and one event.")
+
+        client = Client(HTTP_HOST="127.0.0.1", HTTP_AUTHORIZATION=f"JWT {AccessToken.for_user(user)}")
+        paths = [
+            "/api/events/",
+            f"/api/events/{event.pk}/",
+            "/api/dashboard/user/",
+            "/api/overview/",
+        ]
+        encodings = ["gzip"] + (["br"] if middleware.brotli is not None else [])
+        if middleware.brotli is None:
+            self.stdout.write("brotli is not installed; measuring gzip only.")
+
+        self.stdout.write(f"{'endpoint':<28}{'identity':>10}" + "".join(
+            f"{enc + ' bytes':>12}{'ratio':>7}{'µs/resp':>10}" for enc in encodings
+        ))
+        for path in paths:
+            # Identity response, exactly as the view renders it.
+            response = client.get(path, HTTP_ACCEPT_ENCODING="identity")
+            if response.status_code != 200:
+                self.stderr.write(f"{path}: HTTP {response.status_code}, skipped")
+                continue
+            body = response.content
+            row = f"{path:<28}{len(body):>10}"
+            for encoding in encodings:
+                compressed = middleware.compress(body, encoding)
+                started = time.process_time()
+                for _ in range(options["iterations"]):
+                    middleware.compress(body, encoding)
+                cpu_us = (time.process_time() - started) / options["iterations"] * 1_000_000
+                row += f"{len(compressed):>12}{len(compressed) / len(body):>7.2f}{cpu_us:>10.0f}"
+            self.stdout.write(row)
@@ -0,0 +1,73 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Render and parse the event list and admin dashboard payloads with DRF's stdlib "
+        "JSON renderer/parser and the orjson-backed ones; checks the bytes are identical."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            raise CommandError("orjson is not installed; FastJSONRenderer is using the stdlib.")
+        admin = User.objects.filter(is_active=True, role="admin").order_by("id").first()
+        if admin is None:
+            raise CommandError("Needs an active admin user.")
+
+        client = Client(HTTP_HOST="127.0.0.1", HTTP_AUTHORIZATION=f"JWT {AccessToken.for_user(admin)}")
+        payloads = {
+            "event list": client.get("/api/events/"),
+            "admin dashboard": client.get("/api/dashboard/admin"),
+        }
+
+        failed = False
+        for name, response in payloads.items():
+            if response.status_code != 200:
+                raise CommandError(f"{name}: HTTP {response.status_code}")
+            data = response.data
+            stdlib = JSONRenderer().render(data)
+            fast = FastJSONRenderer().render(data)
+            identical = stdlib == fast
+            failed |= not identical
+
+            render_std = self._time(lambda: JSONRenderer().render(data), options["iterations"])
+            render_fast = self._time(lambda: FastJSONRenderer().render(data), options["iterations"])
+            parse_std = self._time(lambda: self._parse(JSONParser(), stdlib), options["iterations"])
+            parse_fast = self._time(lambda: self._parse(FastJSONParser(), stdlib), options["iterations"])
+
+            self.stdout.write(f"{name} ({len(stdlib)} bytes, identical output: {'yes' if identical else 'NO'})")
+            self.stdout.write(
+                f"  render: stdlib {render_std:8.1f} µs   orjson {render_fast:8.1f} µs   "
+                f"x{render_std / render_fast:.1f}"
+            )
+            self.stdout.write(
+                f"  parse:  stdlib {parse_std:8.1f} µs   orjson {parse_fast:8.1f} µs   "
+                f"x{parse_std / parse_fast:.1f}"
+            )
+        if failed:
+            raise CommandError("orjson output differs from JSONRenderer.")
+
+    def _parse(self, parser, body):
+        return parser.parse(io.BytesIO(body), "application/json", {})
+
+    def _time(self, fn, iterations):
+        fn()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        return (time.perf_counter() - started) / iterations * 1_000_000
@@ -0,0 +1,117 @@
+import json
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.management.loadgen import add_query_delay, percentile, wsgi_request
+from events.models import Event
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure read latency on one threaded worker, alone and during a storm of "
+        "`react` writes, with admission control and throttling on (and, with "
+        "--compare, off). Writes real reactions: use a development database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds per phase.")
+        parser.add_argument("--readers", type=int, default=4, help="Closed-loop read clients.")
+        parser.add_argument("--writers", type=int, default=64, help="Closed-loop write clients.")
+        parser.add_argument("--server-threads", type=int, default=64, help="Threads of the simulated worker.")
+        parser.add_argument(
+            "--max-concurrency", type=int,
+            help="ADMISSION_MAX_CONCURRENCY_PER_WORKER for the run (default: the setting); keep it below --server-threads.",
+        )
+        parser.add_argument(
+            "--query-delay", type=float, default=2.0,
+            help="Milliseconds added to every query, to stand in for a remote database.",
+        )
+        parser.add_argument("--compare", action="store_true", help="Also run the storm without admission control.")
+
+    def handle(self, *args, **options):
+        event = Event.objects.order_by("-id").first()
+        users = list(User.objects.filter(is_active=True).order_by("id")[:200])
+        if event is None or not users:
+            raise CommandError("Needs at least one event and one active user.")
+        self.event = event
+        self.tokens = [f"JWT {AccessToken.for_user(user)}" for user in users]
+        if options["query_delay"]:
+            add_query_delay(options["query_delay"])
+
+        limit = options["max_concurrency"]
+        with override_settings(ADMISSION_MAX_CONCURRENCY_PER_WORKER=limit) if limit is not None else nullcontext():
+            self.run_phase("reads only", options, writers=0)
+            self.run_phase("reads + write storm", options, writers=options["writers"])
+        if options["compare"]:
+            unthrottled = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+            with override_settings(ADMISSION_MAX_CONCURRENCY_PER_WORKER=0, REST_FRAMEWORK=unthrottled):
+                self.run_phase("reads + write storm, no admission control", options, writers=options["writers"])
+
+    def run_phase(self, label, options, writers):
+        handler = WSGIHandler()
+        server = ThreadPoolExecutor(max_workers=options["server_threads"])
+        stop = threading.Event()
+        read_latencies = []
+        write_statuses = Counter()
+        read_statuses = Counter()
+        lock = threading.Lock()
+
+        def reader(index):
+            auth = self.tokens[index % len(self.tokens)]
+            while not stop.is_set():
+                started = time.perf_counter()
+                status = server.submit(
+                    wsgi_request, handler, "/api/events/", headers={"Authorization": auth}
+                ).result()
+                with lock:
+                    read_latencies.append(time.perf_counter() - started)
+                    read_statuses[status] += 1
+
+        def writer(index):
+            auth = self.tokens[index % len(self.tokens)]
+            sequence = 0
+            while not stop.is_set():
+                sequence += 1
+                body = json.dumps({"status": "attending" if sequence % 2 else "interested"}).encode()
+                status = server.submit(
+                    wsgi_request, handler, f"/api/events/{self.event.pk}/react/", method="POST",
+                    headers={"Authorization": auth}, body=body, content_type="application/json",
+                ).result()
+                with lock:
+                    write_statuses[status] += 1
+
+        clients = [threading.Thread(target=reader, args=(i,)) for i in range(options["readers"])]
+        clients += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        for client in clients:
+            client.start()
+        time.sleep(options["duration"])
+        stop.set()
+        for client in clients:
+            client.join()
+        server.shutdown()
+
+        read_latencies.sort()
+        self.stdout.write(f"{label}:")
+        if read_latencies:
+            self.stdout.write(
+                f"  reads  {len(read_latencies) / options['duration']:7.1f} req/s  "
+                f"p50 {statistics.median(read_latencies) * 1000:7.1f} ms  "
+                f"p95 {percentile(read_latencies, 0.95) * 1000:7.1f} ms  "
+                f"p99 {percentile(read_latencies, 0.99) * 1000:7.1f} ms  statuses {dict(read_statuses)}"
+            )
+        if writers:
+            self.stdout.write(
+                f"  writes {sum(write_statuses.values()) / options['duration']:7.1f} req/s  "
+                f"statuses {dict(sorted(write_statuses.items()))}"
+            )
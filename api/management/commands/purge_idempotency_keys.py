@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api import idempotency
+
+
+class Command(BaseCommand):
+    help = "Delete stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep purging periodically.")
+        parser.add_argument("--interval", type=float, default=3600.0, help="Seconds between runs with --loop.")
+        parser.add_argument(
+            "--batch-size", type=int, default=idempotency.BATCH_SIZE, help="Rows deleted per statement."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = idempotency.purge_expired(batch_size=options["batch_size"])
+            self.stdout.write(f"Deleted {deleted} expired idempotency keys")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,57 @@
+"""Helpers shared by the in-process benchmark and load-test commands."""
+import io
+import sys
+import time
+
+from django.db.backends.signals import connection_created
+
+
+def wsgi_request(handler, path, method="GET", headers=None, body=b"", content_type=""):
+    """Run one request through a WSGIHandler; returns the status code."""
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "127.0.0.1",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "127.0.0.1",
+        "CONTENT_TYPE": content_type,
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in (headers or {}).items():
+        environ["HTTP_" + name.upper().replace("-", "_")] = value
+    status = []
+    response = handler(environ, lambda s, response_headers, exc_info=None: status.append(int(s.split()[0])))
+    try:
+        for _ in response:
+            pass
+    finally:
+        response.close()
+    return status[0]
+
+
+def add_query_delay(milliseconds):
+    """Sleep before every query on new connections, to stand in for a remote database."""
+    delay = milliseconds / 1000
+
+    def slow(execute, sql, params, many, context):
+        time.sleep(delay)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        connection.execute_wrappers.append(slow)
+
+    connection_created.connect(install, weak=False)
+
+
+def percentile(ordered, p):
+    """p-th percentile (0-1) of an already sorted list."""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
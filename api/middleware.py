@@ -0,0 +1,239 @@
+"""
+API middleware: response compression and admission control.
+
+Compression is negotiated through Accept-Encoding. Brotli is preferred when
+the `brotli` package is installed and the client accepts it; gzip otherwise.
+Static files are left to WhiteNoise, which serves them precompressed, and
+event streams are never compressed so every SSE frame reaches the browser as
+soon as it is sent.
+"""
+import gzip
+import math
+import threading
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import parse_etags
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# Below this, headers dominate and compression rarely pays for its CPU.
+MIN_SIZE = 1024
+# Quality 4-5 is the usual sweet spot for on-the-fly brotli; 11 is for static assets.
+BROTLI_QUALITY = 4
+GZIP_LEVEL = 6
+
+COMPRESSIBLE_TYPES = ("application/json", "text/html", "text/plain", "text/csv")
+
+_accept_encoding_re = _lazy_re_compile(r"\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?")
+
+
+def accepted_encodings(header):
+    """{coding: q} for an Accept-Encoding header, lower-cased."""
+    accepted = {}
+    for part in header.split(","):
+        match = _accept_encoding_re.match(part)
+        if not match:
+            continue
+        try:
+            q = float(match[2]) if match[2] is not None else 1.0
+        except ValueError:
+            q = 0.0
+        accepted[match[1].lower()] = q
+    return accepted
+
+
+def negotiate(header):
+    """Pick "br", "gzip" or None for the client's Accept-Encoding header."""
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get("*", 0)
+    available = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_q = None, 0
+    for coding in available:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class StreamCompressor:
+    """Incremental compressor that flushes after every chunk, so streams stay live."""
+
+    def __init__(self, encoding):
+        self.brotli = encoding == "br"
+        if self.brotli:
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            # wbits 16+ makes zlib write a gzip header and trailer.
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data):
+        if self.brotli:
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.brotli:
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+    def wrap(self, chunks):
+        for data in chunks:
+            if data:
+                yield self.chunk(data)
+        yield self.finish()
+
+    async def awrap(self, chunks):
+        async for data in chunks:
+            if data:
+                yield self.chunk(data)
+        yield self.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Brotli/gzip for API responses.
+
+    Like Django's GZipMiddleware, it adds `Vary: Accept-Encoding` and weakens
+    strong ETags of compressed responses: the bytes differ per encoding, but
+    the representation doesn't, so If-None-Match keeps matching (the overview
+    endpoint compares ETags weakly). A 304 repeats the tag the client holds,
+    weak only if its 200 was compressed.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        if response.status_code == 304:
+            # There's no body to decide on here. A client holding our weakened
+            # tag got a compressed 200, so answer with the same tag and Vary.
+            etag = response.get("ETag")
+            if etag and "W/" + etag in parse_etags(request.headers.get("If-None-Match", "")):
+                patch_vary_headers(response, ("Accept-Encoding",))
+                self._weaken_etag(response)
+            return response
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type not in COMPRESSIBLE_TYPES:
+            return response
+        if not response.streaming and len(response.content) < MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            compressor = StreamCompressor(encoding)
+            if response.is_async:
+                response.streaming_content = compressor.awrap(response.streaming_content)
+            else:
+                response.streaming_content = compressor.wrap(response.streaming_content)
+            # The compressed length isn't known up front.
+            response.headers.pop("Content-Length", None)
+        else:
+            compressed = compress(response.content, encoding)
+            # Nothing gained (already compact or incompressible): send as is.
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        self._weaken_etag(response)
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def _weaken_etag(self, response):
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+
+
+class AdmissionControlMiddleware:
+    """
+    Caps the requests one worker process handles at once.
+
+    Past ADMISSION_MAX_CONCURRENCY_PER_WORKER a request is turned away
+    immediately with 503 and Retry-After instead of queuing behind the ones in
+    flight. The count is kept in process, so the cap applies per worker; the
+    site as a whole admits that many times the number of workers. Writes may
+    only use the slots outside ADMISSION_READ_RESERVE, so a write storm can't
+    starve reads. Per-user/per-event rates are enforced separately by the
+    token-bucket throttles in api.throttling.
+    """
+    sync_capable = True
+    async_capable = True
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+    RETRY_AFTER = 1
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.capacity = settings.ADMISSION_MAX_CONCURRENCY_PER_WORKER
+        reserved = math.ceil(self.capacity * settings.ADMISSION_READ_RESERVE)
+        self.write_capacity = max(1, self.capacity - reserved)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._writes_in_flight = 0
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.capacity:
+            return self.get_response(request)
+
+        write = request.method not in self.SAFE_METHODS
+        if not self._admit(write):
+            return self._busy()
+        try:
+            return self.get_response(request)
+        finally:
+            self._release(write)
+
+    async def __acall__(self, request):
+        if not self.capacity:
+            return await self.get_response(request)
+
+        write = request.method not in self.SAFE_METHODS
+        if not self._admit(write):
+            return self._busy()
+        try:
+            return await self.get_response(request)
+        finally:
+            self._release(write)
+
+    def _admit(self, write):
+        # Held only for the counter updates, so it never blocks the event loop.
+        with self._lock:
+            if self._in_flight >= self.capacity or (write and self._writes_in_flight >= self.write_capacity):
+                return False
+            self._in_flight += 1
+            self._writes_in_flight += write
+            return True
+
+    def _release(self, write):
+        with self._lock:
+            self._in_flight -= 1
+            self._writes_in_flight -= write
+
+    def _busy(self):
+        response = JsonResponse({"detail": "Server is busy; try again shortly."}, status=503)
+        response["Retry-After"] = str(self.RETRY_AFTER)
+        return response
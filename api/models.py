@@ -1,3 +1,30 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
-# Create your models here.
+
+class IdempotencyKey(models.Model):
+    """
+    The stored outcome of a POST sent with an `Idempotency-Key` header.
+
+    The row is inserted in the same transaction as the work it guards, so a
+    concurrent duplicate waits on the unique index until that transaction
+    ends and then replays `status_code`/`response_body`.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    # "<METHOD> <path>", e.g. "POST /api/events/12/react/".
+    endpoint = models.CharField(max_length=255)
+    # SHA-256 of the request body, to catch a key reused for a different request.
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key', 'endpoint'], name='unique_idempotency_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.key} {self.endpoint} [{self.status_code}]"
@@ -0,0 +1,46 @@
+"""
+Admin changelist pagination for very large tables.
+
+An exact COUNT(*) over tens of millions of rows reads the whole table (or
+index) on every changelist page. For an unfiltered changelist on PostgreSQL,
+EstimatedCountPaginator takes the table's row estimate from pg_class
+(maintained by VACUUM/ANALYZE) and only counts exactly when that is small
+enough to be cheap. A filtered changelist is counted exactly, but over a
+LIMITed subquery, so the count stops at EXACT_COUNT_LIMIT rows: past that the
+changelist pages up to the limit, which is all it needs.
+"""
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+EXACT_COUNT_LIMIT = 100_000
+
+
+class EstimatedCountPaginator(Paginator):
+    exact_count_limit = EXACT_COUNT_LIMIT
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = self._estimated_rows(queryset)
+            if estimate is not None and estimate > self.exact_count_limit:
+                return estimate
+        # SELECT COUNT(*) FROM (SELECT ... LIMIT n): reads at most n rows.
+        return queryset.order_by()[:self.exact_count_limit].count()
+
+    def _estimated_rows(self, queryset):
+        """The planner's row count for the queryset's table, or None if unknown."""
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)",
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 for a table that was never vacuumed or analyzed.
+        if row is None or row[0] is None or row[0] < 0:
+            return None
+        return int(row[0])
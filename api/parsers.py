@@ -0,0 +1,37 @@
+import codecs
+import io
+import re
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from .renderers import FastJSONRenderer, orjson
+
+# orjson reads integers beyond 64 bits as floats; 19 digits is where that can start.
+LONG_INTEGER = re.compile(rb'[0-9]{19}')
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser backed by orjson when it is installed.
+
+    orjson rejects NaN/Infinity like the strict stdlib parser does. Bodies
+    orjson would read differently (integers beyond 64 bits, which it turns
+    into floats, and numbers like 1e400, which it rejects) or can't parse at
+    all go to the stdlib parser, so the result and any error are the same.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if not LONG_INTEGER.search(body):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,83 @@
+"""
+JSON renderer backed by orjson, with the output of DRF's JSONRenderer.
+
+orjson handles dicts, lists (including ReturnDict/ReturnList), strings and
+numbers natively; everything DRF's encoder would special-case (datetimes,
+decimals, lazy strings, querysets...) goes through that encoder's `default`
+so the bytes match. Anything orjson can't produce identically (indentation,
+ASCII-only output, integers beyond 64 bits, floats orjson writes in exponent
+form) falls back to the stdlib renderer, as does every request when orjson
+isn't installed. So do NaN and infinities, which orjson writes as null
+where the stdlib renderer raises (STRICT_JSON).
+"""
+import math
+import re
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+if orjson is not None:
+    # Datetimes go through DRF's encoder (millisecond precision, "Z" for UTC);
+    # non-str keys are stringified like json.dumps does.
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+# A number written with an exponent: orjson gives 1e-7 and 1e16 where repr()
+# gives 1e-07 and 1e+16. Also matches the odd string, which only costs a
+# fallback.
+EXPONENT_FLOAT = re.compile(rb'(?:^|[:,\[])-?[0-9]+(?:\.[0-9]+)?e')
+
+
+def has_non_finite(data):
+    """True if a NaN or infinity is anywhere in these dicts, lists and tuples."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encode = self.encoder_class().default
+
+        def default(obj):
+            # What the encoder returns (e.g. float(decimal)) gets the same check.
+            value = encode(obj)
+            if has_non_finite(value):
+                raise TypeError('non-finite float')
+            return value
+
+        try:
+            ret = orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits; let json.dumps decide.
+            return super().render(data, accepted_media_type, renderer_context)
+        # NaN and infinities come out as null; only then is the walk worth it.
+        if EXPONENT_FLOAT.search(ret) or (b'null' in ret and has_non_finite(data)):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same strict-javascript-subset escaping as JSONRenderer.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,36 @@
+import posixpath
+from urllib.parse import unquote, urlsplit
+
+from rest_framework import serializers
+
+# Sub-requests a single batch may carry.
+MAX_BATCH_SIZE = 20
+
+
+class BatchItemSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET', 'HEAD'], default='GET')
+    path = serializers.CharField(max_length=2000)
+    query = serializers.DictField(required=False, default=dict)
+
+    def validate_path(self, value):
+        if not value.startswith('/'):
+            raise serializers.ValidationError("Must be an absolute path, e.g. /api/events/.")
+        # Decoded and normalised the way routing will see it, so /api/../admin/ is caught.
+        path = posixpath.normpath(unquote(urlsplit(value).path))
+        if not (path + '/').startswith('/api/'):
+            raise serializers.ValidationError("Only /api/ endpoints can be batched.")
+        return value
+
+    def validate_query(self, value):
+        for key, item in value.items():
+            items = item if isinstance(item, list) else [item]
+            if not all(isinstance(v, (str, int, float, bool)) for v in items):
+                raise serializers.ValidationError(f"'{key}' must be a scalar or a list of scalars.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = serializers.ListField(
+        child=BatchItemSerializer(), allow_empty=False, max_length=MAX_BATCH_SIZE
+    )
+    parallel = serializers.BooleanField(default=False)
@@ -1,3 +1,111 @@
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from events.models import Event, EventCategory, EventReaction
+from users.models import User
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(TestCase):
+    """FastJSONRenderer must produce the same bytes as DRF's JSONRenderer."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            "admin@example.com", "pw", first_name="Ad", last_name="Min", role="admin"
+        )
+        cls.organizer = User.objects.create_user(
+            "organizer@example.com", "pw", first_name="Zoë", last_name="Ørsted",
+            role="organizer", is_active=True,
+        )
+        category = EventCategory.objects.create(name="Música")
+        start = timezone.now() - timedelta(days=2)
+        for i in range(6):
+            event = Event.objects.create(
+                title=f"Gig {i}   “quoted”",
+                description="line\nbreak\ttab   emoji 🎸",
+                organizer=cls.organizer,
+                category=category,
+                start_time=start + timedelta(days=i, microseconds=123456),
+                end_time=start + timedelta(days=i, hours=2),
+                venue="Hall",
+                status="published",
+            )
+            EventReaction.objects.create(
+                event=event,
+                user=cls.organizer,
+                status=EventReaction.ATTENDING if i % 2 else EventReaction.INTERESTED,
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def assertSameBytes(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def fetch(self, user, path):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_event_list(self):
+        self.assertSameBytes(self.fetch(self.organizer, "/api/events/"))
+
+    def test_user_dashboard(self):
+        self.assertSameBytes(self.fetch(self.organizer, "/api/dashboard/user/"))
+
+    def test_organizer_dashboard(self):
+        self.assertSameBytes(self.fetch(self.organizer, "/api/dashboard/organizer"))
+
+    def test_admin_dashboard(self):
+        self.assertSameBytes(self.fetch(self.admin, "/api/dashboard/admin"))
+
+    def test_scalars(self):
+        self.assertSameBytes({
+            "decimal": Decimal("12.50"),
+            "big": 2 ** 70,
+            "keys": {1: "int", None: "none", True: "bool"},
+            "floats": [0.1, -0.0, 1e15, 1e-7, 1e-5, 1e16, 1.5e300, 5e-324],
+        })
+        self.assertSameBytes(1e-7)
+
+    def test_non_finite_floats_are_refused(self):
+        for data in ({"x": float("nan")}, [1, [float("inf")]], {"x": Decimal("-Infinity")}):
+            for renderer in (FastJSONRenderer(), JSONRenderer()):
+                with self.assertRaises(ValueError):
+                    renderer.render(data)
+
+
+class FastJSONParserTests(TestCase):
+    """FastJSONParser must read bodies the way DRF's JSONParser does."""
+
+    def assertSameParse(self, body):
+        self.assertEqual(
+            repr(FastJSONParser().parse(io.BytesIO(body))), repr(JSONParser().parse(io.BytesIO(body)))
+        )
+
+    def test_numbers(self):
+        self.assertSameParse(b'{"id": 12, "big": 123456789012345678901234567890, "neg": -9223372036854775809}')
+        self.assertSameParse(b'[18446744073709551616, 1.5, 1e400, -1e400, 1e-400]')
+        self.assertSameParse('{"title": "Zo\\u00eb \\ud83c\\udfb8 Zoë"}'.encode())
 
-# Create your tests here.
+    def test_errors(self):
+        for body in (b'[NaN]', b'{"a": }', b'[1e400, Infinity]'):
+            details = []
+            for parser in (FastJSONParser(), JSONParser()):
+                with self.assertRaises(ParseError) as caught:
+                    parser.parse(io.BytesIO(body))
+                details.append(str(caught.exception.detail))
+            self.assertEqual(details[0], details[1])
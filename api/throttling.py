@@ -0,0 +1,84 @@
+"""
+Token-bucket throttles for write-heavy endpoints, kept in the shared cache.
+
+A view opts in with `throttle_scope` and these throttle classes; the rates
+come from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] under "<scope>.user" and
+"<scope>.event". "30/min" is a bucket of 30 tokens refilled at 30 per minute,
+so short bursts pass and a sustained flood is held to the refill rate.
+
+The bucket is stored as a single timestamp (GCRA: the time at which the
+bucket will be full again), so each check is one cache read and one write.
+Like DRF's own throttles the read-modify-write isn't atomic; concurrent
+requests can overshoot a bucket by at most the number in flight.
+"""
+import math
+import time
+
+from django.core.cache import cache as default_cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """Parse "30/min" into (30, 60)."""
+    num, period = rate.split("/")
+    return int(num), PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    cache = default_cache
+    timer = time.time
+    cache_format = "throttle_%(scope)s_%(ident)s"
+    scope_attr = "throttle_scope"
+    bucket = None
+
+    def get_bucket_ident(self, request, view):
+        raise NotImplementedError(".get_bucket_ident() must be overridden")
+
+    def get_rate(self, scope):
+        # Looked up per request, so settings overrides take effect.
+        return api_settings.DEFAULT_THROTTLE_RATES.get(f"{scope}.{self.bucket}")
+
+    def allow_request(self, request, view):
+        self._wait = None
+        scope = getattr(view, self.scope_attr, None)
+        rate = self.get_rate(scope) if scope else None
+        ident = self.get_bucket_ident(request, view) if rate else None
+        if ident is None:
+            return True
+
+        capacity, period = parse_rate(rate)
+        interval = period / capacity
+        key = self.cache_format % {"scope": f"{scope}.{self.bucket}", "ident": ident}
+
+        now = self.timer()
+        full_at = max(self.cache.get(key, now), now)
+        if full_at - now > period - interval:
+            self._wait = full_at - now - (period - interval)
+            return False
+        full_at += interval
+        self.cache.set(key, full_at, timeout=math.ceil(full_at - now))
+        return True
+
+    def wait(self):
+        return self._wait
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """One bucket per user (per client IP for anonymous requests)."""
+    bucket = "user"
+
+    def get_bucket_ident(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return self.get_ident(request)
+
+
+class EventTokenBucketThrottle(TokenBucketThrottle):
+    """One bucket per event, shared by everyone writing to it."""
+    bucket = "event"
+
+    def get_bucket_ident(self, request, view):
+        return view.kwargs.get("event_pk", view.kwargs.get("pk"))
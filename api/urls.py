@@ -3,6 +3,8 @@ from rest_framework.routers import DefaultRouter
 from rest_framework_nested.routers import NestedDefaultRouter
 from users.views import UserProfileViewSet, UserViewSet
 from events.views import EventViewSet, EventCategoryViewSet, EventScheduleViewSet
+from . import async_views
+from .views import BatchView
 
 router = DefaultRouter()
 router.register(r'users', UserViewSet, basename='user')
@@ -20,4 +22,10 @@ urlpatterns = [
     path("", include("overview.urls")),
     path("events/", include("events.urls")),
     path("dashboard/", include("dashboard.urls")),
+    path("batch/", BatchView.as_view(), name="api-batch"),
+    # Async (ASGI) versions of the hottest read endpoints
+    path("async/events/", async_views.event_list, name="async-event-list"),
+    path("async/events/<int:pk>/", async_views.event_detail, name="async-event-detail"),
+    path("async/dashboard/user/", async_views.user_dashboard, name="async-user-dashboard"),
+    path("async/overview/", async_views.overview, name="async-eventpilot-overview"),
 ]
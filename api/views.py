@@ -1,3 +1,113 @@
-from django.shortcuts import render
+import io
+import json
+from urllib.parse import urlencode, urlsplit, parse_qsl, unquote_to_bytes
 
-# Create your views here.
+from django.core.handlers.exception import response_for_exception
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import Resolver404, resolve
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .concurrency import parallel
+from .serializers import BatchSerializer
+
+# Headers of the batch request that must not leak into its sub-requests.
+_DROPPED_META = ("CONTENT_LENGTH", "CONTENT_TYPE", "HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE")
+
+
+class BatchView(APIView):
+    """
+    POST /api/batch/
+
+    {"requests": [{"method": "GET", "path": "/api/events/", "query": {"date_filter": "today"}}, ...],
+     "parallel": true}
+
+    Dispatches read-only sub-requests through the normal URL routing within
+    this one HTTP request and returns their results in order:
+    {"responses": [{"status": 200, "headers": {...}, "body": ...}, ...]}.
+
+    The caller is authenticated once, here; sub-requests reuse that user and
+    skip the middleware stack, so only DRF views under /api/ can be batched. With "parallel", sub-requests run concurrently
+    on the shared DB thread pool, each on its own connection.
+    """
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['requests']
+
+        if serializer.validated_data['parallel']:
+            results = parallel(**{
+                str(i): (lambda item=item: self._dispatch(request, item)) for i, item in enumerate(items)
+            })
+            responses = [results[str(i)] for i in range(len(items))]
+        else:
+            responses = [self._dispatch(request, item) for item in items]
+
+        return Response({'responses': responses})
+
+    def _subrequest(self, request, item):
+        url = urlsplit(item['path'])
+        query = parse_qsl(url.query, keep_blank_values=True)
+        for key, value in item['query'].items():
+            for v in value if isinstance(value, list) else [value]:
+                query.append((key, str(v).lower() if isinstance(v, bool) else str(v)))
+
+        environ = {k: v for k, v in request.META.items() if k not in _DROPPED_META}
+        environ.update({
+            'REQUEST_METHOD': item['method'],
+            'PATH_INFO': unquote_to_bytes(url.path).decode('iso-8859-1'),
+            'QUERY_STRING': urlencode(query),
+            'wsgi.input': io.BytesIO(),
+        })
+        sub = WSGIRequest(environ)
+        sub.user = request.user
+        if request.user.is_authenticated:
+            # DRF uses these instead of running the authenticators again.
+            sub._force_auth_user = request.user
+            sub._force_auth_token = request.auth
+        return sub
+
+    def _dispatch(self, request, item):
+        sub = self._subrequest(request, item)
+        try:
+            match = resolve(sub.path_info)
+        except Resolver404:
+            return {'status': 404, 'headers': {}, 'body': {'detail': 'Not found.'}}
+        if match.func is request.resolver_match.func:
+            return {'status': 400, 'headers': {}, 'body': {'detail': 'Batches cannot be nested.'}}
+        if not hasattr(match.func, 'cls'):
+            # Plain Django views rely on the middleware this dispatch skips.
+            return {'status': 400, 'headers': {}, 'body': {'detail': 'Only API endpoints can be batched.'}}
+
+        sub.resolver_match = match
+        try:
+            response = match.func(sub, *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        except Exception as exc:
+            # Same 404/403/500 handling the request handler gives a top-level view.
+            response = response_for_exception(sub, exc)
+
+        if response.streaming:
+            # An SSE stream never ends; release it instead of reading it.
+            response.close()
+            return {'status': 400, 'headers': {}, 'body': {'detail': 'Streaming endpoints cannot be batched.'}}
+
+        headers = {k: v for k, v in response.items() if k not in ('Content-Length', 'Vary', 'Allow')}
+        return {
+            'status': response.status_code,
+            'headers': headers,
+            'body': None if item['method'] == 'HEAD' else self._body(response),
+        }
+
+    def _body(self, response):
+        if getattr(response, 'data', None) is not None:
+            return response.data
+        if not response.content:
+            return None
+        if response.get('Content-Type', '').startswith('application/json'):
+            return json.loads(response.content)
+        return response.content.decode(response.charset)
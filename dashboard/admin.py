@@ -1,3 +1,16 @@
 from django.contrib import admin
 
-# Register your models here.
+from api.pagination import EstimatedCountPaginator
+from .models import OrganizerRequest
+
+
+@admin.register(OrganizerRequest)
+class OrganizerRequestAdmin(admin.ModelAdmin):
+    list_display = ("user", "status", "created_at", "reviewed_at")
+    list_select_related = ("user",)
+    # Matches the (status, created_at) index and the default -created_at ordering.
+    list_filter = ("status",)
+    search_fields = ("=user__email",)
+    raw_id_fields = ("user",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-19 02:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def reject_duplicate_pending(apps, schema_editor):
+    """Keep each user's newest pending request; older duplicates become rejected."""
+    OrganizerRequest = apps.get_model('dashboard', 'OrganizerRequest')
+    pending = OrganizerRequest.objects.filter(status='pending')
+    duplicated_users = (
+        pending.values('user_id').annotate(total=models.Count('id')).filter(total__gt=1).values_list('user_id', flat=True)
+    )
+    for user_id in duplicated_users:
+        newest = pending.filter(user_id=user_id).order_by('-created_at', '-id').values_list('id', flat=True).first()
+        pending.filter(user_id=user_id).exclude(id=newest).update(status='rejected', reviewed_at=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(reject_duplicate_pending, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='organizerrequest',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('user',), name='unique_pending_organizer_request'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-19 02:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_unique_pending_organizer_request'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organizerrequest',
+            index=models.Index(fields=['status', 'created_at'], name='dashboard_o_status_28492d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organizerrequest',
+            index=models.Index(fields=['user', 'created_at'], name='dashboard_o_user_id_3fde81_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-19 04:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_organizer_request_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='organizerrequest',
+            name='dashboard_o_status_28492d_idx',
+        ),
+        migrations.AddIndex(
+            model_name='organizerrequest',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='dashboard_o_status_9de1f8_idx'),
+        ),
+    ]
@@ -1,7 +1,61 @@
-from django.db import models
+from datetime import timedelta
+
+from django.db import models, connection, transaction
+from django.db.models import Q
 from django.conf import settings
 from django.utils.timezone import now
 
+# Days a rejected user has to wait before requesting again.
+REQUEST_COOLDOWN_DAYS = 90
+
+
+class OrganizerRequestManager(models.Manager):
+    def submit(self, user):
+        """
+        Create a pending request for `user` in a single round trip.
+
+        The partial unique index raises IntegrityError if the user already has a
+        pending request, and the INSERT ... SELECT inserts nothing while a
+        recent rejection is still cooling down (returns None in that case). A
+        pending request takes precedence: the insert is still attempted then,
+        so the caller hears "already pending" rather than "must wait".
+        """
+        table = self.model._meta.db_table
+        created_at = now()
+        cutoff = created_at - timedelta(days=REQUEST_COOLDOWN_DAYS)
+        sql = f"""
+            INSERT INTO {table} (user_id, status, created_at)
+            SELECT %s, 'pending', %s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {table}
+                WHERE user_id = %s AND status = 'rejected' AND reviewed_at > %s
+            ) OR EXISTS (
+                SELECT 1 FROM {table}
+                WHERE user_id = %s AND status = 'pending'
+            )
+            RETURNING id
+        """
+        params = [user.pk, created_at, user.pk, cutoff, user.pk]
+
+        # Outside a transaction a failed INSERT leaves the connection usable, so
+        # only pay for a savepoint when we're nested in one.
+        if connection.in_atomic_block:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+
+        if row is None:
+            return None
+        instance = self.model(id=row[0], user=user, status='pending', created_at=created_at)
+        instance._state.adding = False
+        instance._state.db = self.db
+        return instance
+
+
 class OrganizerRequest(models.Model):
     STATUS_CHOICES = (
         ('pending', 'Pending'),
@@ -14,8 +68,21 @@ class OrganizerRequest(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     reviewed_at = models.DateTimeField(null=True, blank=True)
 
+    objects = OrganizerRequestManager()
+
     class Meta:
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=Q(status='pending'),
+                name='unique_pending_organizer_request',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'created_at', 'id']),
+            models.Index(fields=['user', 'created_at']),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.status}"
@@ -24,6 +91,6 @@ class OrganizerRequest(models.Model):
         """Return (True, None) if can request again, else (False, days_remaining)"""
         if self.status == 'rejected' and self.reviewed_at:
             days_passed = (now() - self.reviewed_at).days
-            if days_passed < 90:
-                return False, 90 - days_passed
+            if days_passed < REQUEST_COOLDOWN_DAYS:
+                return False, REQUEST_COOLDOWN_DAYS - days_passed
         return True, None
\ No newline at end of file
@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import OrganizerRequest
+from .serializers import OrganizerRequestSerializer
+
+# Safety net only; every create/review invalidates the entry explicitly.
+STATUS_CACHE_TTL = 60 * 60
+# After a change the entry is pinned to a marker for a few seconds, so a poll
+# that read the old row just before the change commits can't cache it again.
+REVOKED_TTL = 10
+REVOKED = "revoked"
+
+
+def _key(user_id):
+    return f"organizer-request-status:{user_id}"
+
+
+def _load(user_id):
+    request_obj = (
+        OrganizerRequest.objects.filter(user_id=user_id)
+        .select_related("user", "user__profile")
+        .order_by("-created_at")
+        .first()
+    )
+    if not request_obj:
+        return {"data": {"status": "none"}}
+    # reviewed_at is kept raw so the cooldown is computed at read time.
+    return {
+        "data": OrganizerRequestSerializer(request_obj).data,
+        "reviewed_at": request_obj.reviewed_at,
+    }
+
+
+def get_request_status(user_id):
+    """Return the user's latest organizer request status payload, cached."""
+    entry = cache.get(_key(user_id))
+    if not isinstance(entry, dict):
+        revoked = entry == REVOKED
+        entry = _load(user_id)
+        if not revoked:
+            cache.add(_key(user_id), entry, timeout=STATUS_CACHE_TTL)
+
+    data = dict(entry["data"])
+    if data["status"] == "none":
+        return data
+
+    request_obj = OrganizerRequest(status=data["status"], reviewed_at=entry["reviewed_at"])
+    if request_obj.status == "rejected":
+        can_request, remaining_days = request_obj.can_request_again()
+        data["can_request_again"] = can_request
+        data["remaining_days"] = remaining_days if not can_request else 0
+    else:
+        data["can_request_again"] = True
+        data["remaining_days"] = 0
+    return data
+
+
+def invalidate_request_status(*user_ids):
+    """Revoke cached statuses now and again once the current transaction commits."""
+    entries = {_key(user_id): REVOKED for user_id in user_ids}
+    if not entries:
+        return
+    cache.set_many(entries, timeout=REVOKED_TTL)
+    transaction.on_commit(lambda: cache.set_many(entries, timeout=REVOKED_TTL))
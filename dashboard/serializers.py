@@ -1,4 +1,5 @@
 # events/serializers.py
+from django.db import IntegrityError
 from rest_framework import serializers
 from dashboard.models import OrganizerRequest
 
@@ -21,7 +22,25 @@ class OrganizerRequestSerializer(serializers.ModelSerializer):
 
         if user.role == 'organizer':
             raise serializers.ValidationError("You are already an organizer.")
-        if OrganizerRequest.objects.filter(user=user, status='pending').exists():
+
+        try:
+            instance = OrganizerRequest.objects.submit(user)
+        except IntegrityError:
             raise serializers.ValidationError("You already have a pending request.")
 
-        return OrganizerRequest.objects.create(user=user)
+        if instance is None:
+            # Only the rejection path pays for a second query.
+            last_rejected = (
+                OrganizerRequest.objects.filter(user=user, status='rejected', reviewed_at__isnull=False)
+                .order_by('-reviewed_at')
+                .first()
+            )
+            remaining = last_rejected.can_request_again()[1]
+            raise serializers.ValidationError({"detail": f"You must wait {remaining} more days before requesting again."})
+
+        return instance
+
+
+class OrganizerRequestBulkReviewSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=1000)
+    status = serializers.ChoiceField(choices=['approved', 'rejected'])
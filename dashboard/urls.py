@@ -1,6 +1,7 @@
 from django.urls import path
 from .views import UserDashboardView, OrganizerDashboardView, AdminDashboardView, OrganizerRequestCreateView
 from .views import OrganizerRequestUpdateView, OrganizerRequestListView, OrganizerRequestStatusView, OrganizerRequestDetailView
+from .views import OrganizerRequestBulkReviewView
 
 urlpatterns = [
     path("user/", UserDashboardView.as_view(), name="user-dashboard"),
@@ -11,5 +12,6 @@ urlpatterns = [
     path('request-organizer/list/', OrganizerRequestListView.as_view(), name='list-organizer-requests'),
     path('request-organizer/<int:pk>/update/', OrganizerRequestUpdateView.as_view(), name='approve-organizer-request'),
     path("request-organizer/status/", OrganizerRequestStatusView.as_view(), name="request-organizer-status"),
+    path("request-organizer/bulk-review/", OrganizerRequestBulkReviewView.as_view(), name="bulk-review-organizer-requests"),
 
 ]
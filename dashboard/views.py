@@ -1,12 +1,13 @@
 # views.py
 from django.utils import timezone
-from django.db.models import Prefetch
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from events.models import EventReaction, Event, EventCategory
 from events.serializers import EventSerializer
+from events import leaderboards, reaction_index
 from dateutil.relativedelta import relativedelta
 from django.utils.timezone import now
 from datetime import timedelta
@@ -15,99 +16,104 @@ from django.db.models.functions import TruncMonth, TruncYear
 import calendar
 from collections import OrderedDict
 from users.models import User
-from .serializers import OrganizerRequestSerializer
+from users.authentication import invalidate_principal
+from .serializers import OrganizerRequestSerializer, OrganizerRequestBulkReviewSerializer
 from rest_framework import generics, permissions
 from .models import OrganizerRequest
-from rest_framework import serializers
-
+from .pagination import OrganizerRequestCursorPagination
+from .request_status import get_request_status, invalidate_request_status
+from api.concurrency import parallel
+
+
+
+def user_events_queryset(user):
+    """Events the user reacted to."""
+    # 1 query for events (with organizer+category joined); the user's own
+    # reactions come from the cached reaction map (events.reaction_index).
+    return (
+        Event.objects.filter(reactions__user=user)
+        .select_related("organizer", "category")
+        .distinct()
+    )
+
+
+def user_dashboard_payload(user_events, request, statuses):
+    """
+    Bucket already-fetched events into the dashboard sections; no queries.
+    `statuses` is the user's {event_id: status} reaction map.
+    """
+    now = timezone.now()
+    # day bounds
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    today_end = today_start.replace(hour=23, minute=59, second=59, microsecond=999999)
+    today_date = today_start.date()
+
+    # Buckets
+    today_attending = []
+    today_interested = []
+    ongoing = []
+    upcoming_attending = []
+    upcoming_interested = []
+    archived = []
+
+    context = {"request": request, "reaction_statuses": statuses}
+
+    for ev in user_events:
+        s = statuses.get(ev.pk)
+
+        is_ongoing = ev.start_time <= now <= ev.end_time
+        if is_ongoing:
+            ongoing.append(ev)
+            continue  # exclusive buckets
+
+        # today but NOT ongoing
+        is_today = (ev.start_time.date() == today_date) or (ev.end_time.date() == today_date)
+        if is_today:
+            if s == EventReaction.ATTENDING:
+                today_attending.append(ev)
+            elif s == EventReaction.INTERESTED:
+                today_interested.append(ev)
+            # if no status, skip (shouldn't happen because base qs filters by reactions__user)
+            continue
+
+        # upcoming after today end
+        if ev.start_time > today_end:
+            if s == EventReaction.ATTENDING:
+                upcoming_attending.append(ev)
+            elif s == EventReaction.INTERESTED:
+                upcoming_interested.append(ev)
+            continue
+
+        # archived before today start
+        if ev.end_time < today_start:
+            archived.append(ev)
+            continue
+        # Any leftovers are neither today/upcoming/archived; they’re multi-day in the past-but-not-before-today_start,
+        # but we already handled ongoing==False; usually this means ended earlier today (caught by 'today')
+        # or spans earlier days but ends today (also 'today'). So typically no leftovers.
+
+    return {
+        "today": {
+            "attending": EventSerializer(today_attending, many=True, context=context).data,
+            "interested": EventSerializer(today_interested, many=True, context=context).data,
+        },
+        "ongoing": EventSerializer(ongoing, many=True, context=context).data,
+        "upcoming": {
+            "attending": EventSerializer(upcoming_attending, many=True, context=context).data,
+            "interested": EventSerializer(upcoming_interested, many=True, context=context).data,
+        },
+        "archived": EventSerializer(archived, many=True, context=context).data,
+    }
 
 
 class UserDashboardView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        user = request.user
-        now = timezone.now()
-        # day bounds
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start.replace(hour=23, minute=59, second=59, microsecond=999999)
-        today_date = today_start.date()
-
-        # Prefetch only THIS user's reaction into `my_reaction_list`.
-        user_reactions = EventReaction.objects.filter(user=user)
-
-        # 1 query for events (with organizer+category joined), plus 1 prefetch for reactions.
-        user_events_qs = (
-            Event.objects.filter(reactions__user=user)
-            .select_related("organizer", "category")
-            .prefetch_related(
-                Prefetch("reactions", queryset=user_reactions, to_attr="my_reaction_list")
-            )
-            .distinct()
-        )
-
         # Evaluate ONCE and bucket in Python (prevents repeated prefetch queries).
-        user_events = list(user_events_qs)
-
-        # Buckets
-        today_attending = []
-        today_interested = []
-        ongoing = []
-        upcoming_attending = []
-        upcoming_interested = []
-        archived = []
-
-        # Helper to read user's reaction status without hitting DB
-        def status_of(ev):
-            # my_reaction_list exists (prefetched); either [] or [EventReaction]
-            return ev.my_reaction_list[0].status if getattr(ev, "my_reaction_list", []) else None
-
-        for ev in user_events:
-            s = status_of(ev)
-
-            is_ongoing = ev.start_time <= now <= ev.end_time
-            if is_ongoing:
-                ongoing.append(ev)
-                continue  # exclusive buckets
-
-            # today but NOT ongoing
-            is_today = (ev.start_time.date() == today_date) or (ev.end_time.date() == today_date)
-            if is_today:
-                if s == EventReaction.ATTENDING:
-                    today_attending.append(ev)
-                elif s == EventReaction.INTERESTED:
-                    today_interested.append(ev)
-                # if no status, skip (shouldn't happen because base qs filters by reactions__user)
-                continue
-
-            # upcoming after today end
-            if ev.start_time > today_end:
-                if s == EventReaction.ATTENDING:
-                    upcoming_attending.append(ev)
-                elif s == EventReaction.INTERESTED:
-                    upcoming_interested.append(ev)
-                continue
-
-            # archived before today start
-            if ev.end_time < today_start:
-                archived.append(ev)
-                continue
-            # Any leftovers are neither today/upcoming/archived; they’re multi-day in the past-but-not-before-today_start,
-            # but we already handled ongoing==False; usually this means ended earlier today (caught by 'today')
-            # or spans earlier days but ends today (also 'today'). So typically no leftovers.
-
-        return Response({
-            "today": {
-                "attending": EventSerializer(today_attending, many=True, context={"request": request}).data,
-                "interested": EventSerializer(today_interested, many=True, context={"request": request}).data,
-            },
-            "ongoing": EventSerializer(ongoing, many=True, context={"request": request}).data,
-            "upcoming": {
-                "attending": EventSerializer(upcoming_attending, many=True, context={"request": request}).data,
-                "interested": EventSerializer(upcoming_interested, many=True, context={"request": request}).data,
-            },
-            "archived": EventSerializer(archived, many=True, context={"request": request}).data,
-        })
+        user_events = list(user_events_queryset(request.user))
+        statuses = reaction_index.statuses_for(request.user.pk)
+        return Response(user_dashboard_payload(user_events, request, statuses))
 
 
 
@@ -127,6 +133,7 @@ class OrganizerDashboardView(APIView):
         total_events = events_qs.filter(created_at__lte=current_time).count()
         total_attendees = EventReaction.objects.filter(
             event__organizer=user,
+            event__deleted_at__isnull=True,
             created_at__lte=current_time,
             status=EventReaction.ATTENDING
         ).count()
@@ -220,35 +227,34 @@ class AdminDashboardView(APIView):
         if user.role != "admin":
             return Response({"detail": "Only admins can access this endpoint."}, status=403)
 
-        # --- Totals ---
-        total_users = User.objects.count()
-        total_events = Event.objects.count()
-        total_attendees = EventReaction.objects.filter(
-            status=EventReaction.ATTENDING
-        ).count()
+        # --- Time ranges ---
+        one_year_ago = now() - timedelta(days=365)
+        five_years_ago = now() - timedelta(days=365 * 5)
+
+        # Reactions of deleted events (and the events themselves, through
+        # relations) stay out of the numbers before the purge runs.
+        live_reactions = EventReaction.objects.filter(event__deleted_at__isnull=True)
+        live_events = Q(organized_events__deleted_at__isnull=True)
+        live_users = User.objects.filter(deleted_at__isnull=True)
 
         # --- Breakdown ---
-        users_by_role = User.objects.values("role").annotate(count=Count("id"))
+        users_by_role = live_users.values("role").annotate(count=Count("id"))
         events_by_status = Event.objects.values("status").annotate(count=Count("id"))
         events_by_category = (
-            EventCategory.objects.annotate(count=Count("events"))
+            EventCategory.objects.annotate(count=Count("events", filter=Q(events__deleted_at__isnull=True)))
             .values("name", "count")
         )
 
-        # --- Time ranges ---
-        one_year_ago = now() - timedelta(days=365)
-        five_years_ago = now() - timedelta(days=365 * 5)
-
         # --- Trends: Users ---
         monthly_users = (
-            User.objects.filter(date_joined__gte=one_year_ago)
+            live_users.filter(date_joined__gte=one_year_ago)
             .annotate(month=TruncMonth("date_joined"))
             .values("month")
             .annotate(count=Count("id"))
             .order_by("month")
         )
         yearly_users = (
-            User.objects.filter(date_joined__gte=five_years_ago)
+            live_users.filter(date_joined__gte=five_years_ago)
             .annotate(year=TruncYear("date_joined"))
             .values("year")
             .annotate(count=Count("id"))
@@ -273,7 +279,7 @@ class AdminDashboardView(APIView):
 
         # --- Trends: Attendees ---
         monthly_attendees = (
-            EventReaction.objects.filter(
+            live_reactions.filter(
                 status=EventReaction.ATTENDING, created_at__gte=one_year_ago
             )
             .annotate(month=TruncMonth("created_at"))
@@ -282,7 +288,7 @@ class AdminDashboardView(APIView):
             .order_by("month")
         )
         yearly_attendees = (
-            EventReaction.objects.filter(
+            live_reactions.filter(
                 status=EventReaction.ATTENDING, created_at__gte=five_years_ago
             )
             .annotate(year=TruncYear("created_at"))
@@ -291,42 +297,14 @@ class AdminDashboardView(APIView):
             .order_by("year")
         )
 
-        # --- Top 5 Rankings ---
-        top_events = (
-            Event.objects.annotate(
-                attendee_count=Count(
-                    "reactions", filter=Q(reactions__status=EventReaction.ATTENDING)
-                )
-            )
-            .order_by("-attendee_count")[:5]
-            .values("id", "title", "attendee_count")
-        )
-        top_organizers_by_events = (
-            User.objects.filter(role="organizer")
-            .annotate(events_count=Count("organized_events"))
-            .order_by("-events_count")[:5]
-            .values("id", "first_name", "last_name", "events_count")
-        )
-        top_organizers_by_attendees = (
-            User.objects.filter(role="organizer")
-            .annotate(
-                attendee_count=Count(
-                    "organized_events__reactions",
-                    filter=Q(organized_events__reactions__status=EventReaction.ATTENDING),
-                )
-            )
-            .order_by("-attendee_count")[:5]
-            .values("id", "first_name", "last_name", "attendee_count")
-        )
-
         # --- Organizer performance table ---
         organizer_performance = (
-            User.objects.filter(role="organizer")
+            live_users.filter(role="organizer")
             .annotate(
-                events_count=Count("organized_events", distinct=True),
+                events_count=Count("organized_events", filter=live_events, distinct=True),
                 attendees_count=Count(
                     "organized_events__reactions",
-                    filter=Q(
+                    filter=live_events & Q(
                         organized_events__reactions__status=EventReaction.ATTENDING
                     ),
                     distinct=True,
@@ -337,32 +315,49 @@ class AdminDashboardView(APIView):
         )
 
         # --- System health ---
-        system_health = Event.objects.aggregate(
-            draft_events=Count("id", filter=Q(status="draft")),
-            cancelled_events=Count("id", filter=Q(status="cancelled")),
-            waitlist_enabled=Count("id", filter=Q(allow_waitlist=True)),
-        )
-        full_events = (
-            Event.objects.annotate(
-                attendee_count=Count(
-                    "reactions", filter=Q(reactions__status=EventReaction.ATTENDING)
-                )
+        full_events = Event.objects.annotate(
+            attendee_count=Count(
+                "reactions", filter=Q(reactions__status=EventReaction.ATTENDING)
             )
-            .filter(attendee_count__gte=F("capacity"))
-            .count()
+        ).filter(attendee_count__gte=F("capacity"))
+
+        # The queries are independent, so run them side by side instead of back to back.
+        results = parallel(
+            total_users=live_users.count,
+            total_events=Event.objects.count,
+            total_attendees=live_reactions.filter(status=EventReaction.ATTENDING).count,
+            users_by_role=lambda: list(users_by_role),
+            events_by_status=lambda: list(events_by_status),
+            events_by_category=lambda: list(events_by_category),
+            monthly_users=lambda: list(monthly_users),
+            yearly_users=lambda: list(yearly_users),
+            monthly_events=lambda: list(monthly_events),
+            yearly_events=lambda: list(yearly_events),
+            monthly_attendees=lambda: list(monthly_attendees),
+            yearly_attendees=lambda: list(yearly_attendees),
+            # Top 5 rankings (maintained incrementally, see events.leaderboards)
+            top_events=lambda: leaderboards.top("event_attendance", 5),
+            top_organizers_by_events=lambda: leaderboards.top("organizer_events", 5),
+            top_organizers_by_attendees=lambda: leaderboards.top("organizer_attendees", 5),
+            organizer_performance=lambda: list(organizer_performance),
+            system_health=lambda: Event.objects.aggregate(
+                draft_events=Count("id", filter=Q(status="draft")),
+                cancelled_events=Count("id", filter=Q(status="cancelled")),
+                waitlist_enabled=Count("id", filter=Q(allow_waitlist=True)),
+            ),
+            full_events=full_events.count,
         )
-
         # --- Format response ---
         data = {
             "totals": {
-                "users": total_users,
-                "events": total_events,
-                "attendees": total_attendees,
+                "users": results["total_users"],
+                "events": results["total_events"],
+                "attendees": results["total_attendees"],
             },
             "breakdowns": {
-                "users_by_role": list(users_by_role),
-                "events_by_status": list(events_by_status),
-                "events_by_category": list(events_by_category),
+                "users_by_role": list(results["users_by_role"]),
+                "events_by_status": list(results["events_by_status"]),
+                "events_by_category": list(results["events_by_category"]),
             },
             "trends": {
                 "monthly": {
@@ -372,7 +367,7 @@ class AdminDashboardView(APIView):
                             "year": d["month"].year,
                             "count": d["count"],
                         }
-                        for d in monthly_users
+                        for d in results["monthly_users"]
                     ],
                     "events": [
                         {
@@ -380,7 +375,7 @@ class AdminDashboardView(APIView):
                             "year": d["month"].year,
                             "count": d["count"],
                         }
-                        for d in monthly_events
+                        for d in results["monthly_events"]
                     ],
                     "attendees": [
                         {
@@ -388,33 +383,33 @@ class AdminDashboardView(APIView):
                             "year": d["month"].year,
                             "count": d["count"],
                         }
-                        for d in monthly_attendees
+                        for d in results["monthly_attendees"]
                     ],
                 },
                 "yearly": {
                     "users": [
                         {"year": d["year"].year, "count": d["count"]}
-                        for d in yearly_users
+                        for d in results["yearly_users"]
                     ],
                     "events": [
                         {"year": d["year"].year, "count": d["count"]}
-                        for d in yearly_events
+                        for d in results["yearly_events"]
                     ],
                     "attendees": [
                         {"year": d["year"].year, "count": d["count"]}
-                        for d in yearly_attendees
+                        for d in results["yearly_attendees"]
                     ],
                 },
             },
             "rankings": {
-                "top_events_by_attendance": list(top_events),
-                "top_organizers_by_events": list(top_organizers_by_events),
-                "top_organizers_by_attendees": list(top_organizers_by_attendees),
+                "top_events_by_attendance": list(results["top_events"]),
+                "top_organizers_by_events": list(results["top_organizers_by_events"]),
+                "top_organizers_by_attendees": list(results["top_organizers_by_attendees"]),
             },
-            "organizer_performance": list(organizer_performance),
+            "organizer_performance": list(results["organizer_performance"]),
             "system_health": {
-                **system_health,
-                "full_events": full_events,
+                **results["system_health"],
+                "full_events": results["full_events"],
             },
         }
 
@@ -427,24 +422,14 @@ class OrganizerRequestCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
-        user = self.request.user
-
-        # Check if already has pending
-        if OrganizerRequest.objects.filter(user=user, status='pending').exists():
-            raise serializers.ValidationError({"detail": "You already have a pending request."})
-
-        # Check if previously rejected within 90 days
-        last_rejected = OrganizerRequest.objects.filter(user=user, status='rejected').order_by('-reviewed_at').first()
-        if last_rejected and not last_rejected.can_request_again()[0]:
-            remaining = last_rejected.can_request_again()[1]
-            raise serializers.ValidationError({"detail": f"You must wait {remaining} more days before requesting again."})
-
-        serializer.save(user=user)
+        instance = serializer.save()
+        invalidate_request_status(instance.user_id)
 
 
 class OrganizerRequestListView(generics.ListAPIView):
     serializer_class = OrganizerRequestSerializer
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = OrganizerRequestCursorPagination
 
     def get_queryset(self):
         # join user and the user's profile in one query
@@ -466,7 +451,52 @@ class OrganizerRequestUpdateView(generics.UpdateAPIView):
         instance = serializer.save(reviewed_at=now())
         if instance.status == 'approved':
             instance.user.role = 'organizer'
-            instance.user.save()
+            instance.user.save(update_fields=['role'])
+        invalidate_request_status(instance.user_id)
+
+
+class OrganizerRequestBulkReviewView(APIView):
+    """
+    Approve or reject many pending requests at once.
+    Body: {"ids": [1, 2, ...], "status": "approved" | "rejected"}
+
+    Runs a fixed number of queries regardless of how many ids are sent.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        serializer = OrganizerRequestBulkReviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = set(serializer.validated_data['ids'])
+        new_status = serializer.validated_data['status']
+        reviewed_at = now()
+
+        with transaction.atomic():
+            pending = list(
+                OrganizerRequest.objects.select_for_update()
+                .filter(id__in=ids, status='pending')
+                .values_list('id', 'user_id')
+            )
+            request_ids = [request_id for request_id, _ in pending]
+            user_ids = [user_id for _, user_id in pending]
+
+            OrganizerRequest.objects.filter(id__in=request_ids).update(
+                status=new_status, reviewed_at=reviewed_at
+            )
+            if new_status == 'approved' and user_ids:
+                User.objects.filter(id__in=user_ids).update(role='organizer')
+                invalidate_principal(*user_ids)
+            invalidate_request_status(*user_ids)
+
+        if new_status == 'approved' and user_ids:
+            # Queryset updates bypass the signals that keep the boards current.
+            leaderboards.invalidate(*leaderboards.ORGANIZER_BOARDS)
+
+        return Response({
+            "status": new_status,
+            "updated": request_ids,
+            "skipped": sorted(ids - set(request_ids)),
+        })
 
 class OrganizerRequestDetailView(generics.RetrieveAPIView):
     queryset = OrganizerRequest.objects.select_related("user", "user__profile")
@@ -479,28 +509,5 @@ class OrganizerRequestStatusView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        user_id = request.user.id
-
-        # Single query with user prefetched
-        request_obj = (
-            OrganizerRequest.objects.filter(user_id=user_id)
-            .select_related("user")
-            .order_by("-created_at")
-            .first()
-        )
-
-        if not request_obj:
-            return Response({"status": "none"}, status=200)
-
-        serializer = OrganizerRequestSerializer(request_obj)
-        data = serializer.data
-
-        if request_obj.status == "rejected":
-            can_request, remaining_days = request_obj.can_request_again()
-            data["can_request_again"] = can_request
-            data["remaining_days"] = remaining_days if not can_request else 0
-        else:
-            data["can_request_again"] = True
-            data["remaining_days"] = 0
-
-        return Response(data, status=200)
\ No newline at end of file
+        # Served from the cache; create/review invalidate the user's entry.
+        return Response(get_request_status(request.user.id), status=200)
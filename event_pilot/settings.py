@@ -16,6 +16,7 @@ from decouple import config
 import sys
 import os
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     "whitenoise.runserver_nostatic",
     'drf_yasg',
     'rest_framework',
@@ -52,15 +54,20 @@ INSTALLED_APPS = [
     'events',
     'dashboard',
     'overview',
+    'notifications',
     'api',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    # After WhiteNoise, so static files (served precompressed) never reach it.
+    "api.middleware.CompressionMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     "corsheaders.middleware.CorsMiddleware",
+    # Below CORS, so browsers can read its 503s.
+    "api.middleware.AdmissionControlMiddleware",
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -78,6 +85,10 @@ CORS_ALLOWED_ORIGINS = [
     "https://eventpilot-pearl.vercel.app"
 ]
 
+# Browsers may send Idempotency-Key on retried POSTs (api.idempotency).
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+CORS_EXPOSE_HEADERS = ["Idempotent-Replayed"]
+
 
 ROOT_URLCONF = 'event_pilot.urls'
 
@@ -117,9 +128,35 @@ DATABASES = {
         'PASSWORD': config('password'),
         'HOST': config('host'),
         'PORT': config('port', default='5432'),
+        # Keep connections across requests. The api.concurrency pool threads
+        # rely on this too: with 0, every parallel() task would open (and
+        # close) its own connection, and the setup cost eats the overlap.
+        'CONN_MAX_AGE': config('CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Cache
+# Point this at a shared backend (e.g. Redis) in production so cached
+# snapshots and invalidations are visible to every worker.
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='eventpilot'),
+    }
+}
+
+# Live event counters (Server-Sent Events). The local broker only reaches
+# subscribers in the same process; point this at a cross-process broker when
+# running more than one ASGI worker.
+LIVE_BROKER = config('LIVE_BROKER', default='events.live.LocalBroker')
+LIVE_UPDATES_PER_SECOND = config('LIVE_UPDATES_PER_SECOND', default=2, cast=float)
+
+# Threads used to run independent queries concurrently (see api.concurrency);
+# each holds its own database connection.
+DB_THREAD_POOL_SIZE = config('DB_THREAD_POOL_SIZE', default=8, cast=int)
+
 AUTH_USER_MODEL = 'users.User'
 
 cloudinary.config( 
@@ -144,16 +181,43 @@ SWAGGER_SETTINGS = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
+    # orjson-backed, same bytes as DRF's JSON renderer/parser; stdlib fallback.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 12,
+    # Token buckets (api.throttling) for write-heavy actions: "<scope>.user" and "<scope>.event".
+    'DEFAULT_THROTTLE_RATES': {
+        'react.user': '20/min',
+        'react.event': '50/s',
+        'schedule_bulk.user': '20/min',
+        'schedule_bulk.event': '5/s',
+    },
 }
 
+# Admission control (api.middleware): requests each worker process lets into the
+# app at once (0 disables) and the share of those slots kept for reads. The cap
+# is per worker, not global: the site admits workers x this. Give each worker
+# more threads than this, so the excess is rejected instead of queued.
+ADMISSION_MAX_CONCURRENCY_PER_WORKER = config('ADMISSION_MAX_CONCURRENCY_PER_WORKER', default=32, cast=int)
+ADMISSION_READ_RESERVE = config('ADMISSION_READ_RESERVE', default=0.25, cast=float)
+
+# Seconds a stored Idempotency-Key response is replayed for; purge_idempotency_keys deletes older ones.
+IDEMPOTENCY_KEY_TTL = config('IDEMPOTENCY_KEY_TTL', default=24 * 3600, cast=int)
+
 
 SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('JWT',),
@@ -182,7 +246,10 @@ DJOSER = {
     }
 }
 
-EMAIL_BACKEND = config('EMAIL_BACKEND')
+# Mail is queued in the outbox and delivered by `manage.py send_outbox`
+# through the real transport configured below.
+EMAIL_BACKEND = 'notifications.backends.OutboxEmailBackend'
+OUTBOX_EMAIL_BACKEND = config('EMAIL_BACKEND')
 EMAIL_HOST = config('EMAIL_HOST')
 EMAIL_PORT = config('EMAIL_PORT')
 EMAIL_USE_TLS = config('EMAIL_USE_TLS')
@@ -25,7 +25,6 @@ urlpatterns = [
     path('api/', include('api.urls')),
     path('auth/', include('users.urls')),
     path('api-auth/', include('rest_framework.urls')),
-    re_path(r'^auth/', include('djoser.urls')),
     re_path(r'^auth/', include('djoser.urls.jwt')),
     path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
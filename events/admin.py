@@ -1,3 +1,64 @@
 from django.contrib import admin
 
-# Register your models here.
+from api.admin import DeletedListFilter
+from api.pagination import EstimatedCountPaginator
+from .models import Event, EventReaction, EventSchedule
+from .purge import mark_events_deleted
+
+# Changelists of the large tables: joins instead of per-row lookups, raw-id
+# widgets instead of <select>s listing every user/event, filters backed by an
+# index, and no exact COUNT(*) (see api.pagination).
+
+
+@admin.register(Event)
+class EventAdmin(admin.ModelAdmin):
+    list_display = ("title", "organizer", "category", "status", "visibility", "start_time", "end_time")
+    list_select_related = ("organizer", "category")
+    # (status, start_time) and start_time are indexed; categories are few.
+    list_filter = (DeletedListFilter, "status", "category")
+    date_hierarchy = "start_time"
+    search_fields = ("title",)
+    raw_id_fields = ("organizer",)
+    readonly_fields = ("created_at", "updated_at", "deleted_at")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # Deleted events stay reachable here; DeletedListFilter hides them by default.
+        qs = Event.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            qs = qs.order_by(*ordering)
+        return qs
+
+    # Deleting soft-deletes like the API does; the purge removes the rows.
+    def delete_model(self, request, obj):
+        mark_events_deleted([obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        mark_events_deleted(list(queryset.values_list("pk", flat=True)))
+
+
+@admin.register(EventReaction)
+class EventReactionAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "event", "status", "created_at")
+    list_select_related = ("user", "event")
+    list_filter = ("status",)
+    # Exact matches only: a substring search would scan every reaction.
+    search_fields = ("=user__email",)
+    raw_id_fields = ("user", "event")
+    # Newest first by primary key, which needs no sort.
+    ordering = ("-id",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(EventSchedule)
+class EventScheduleAdmin(admin.ModelAdmin):
+    list_display = ("title", "event", "start_datetime", "end_datetime")
+    list_select_related = ("event",)
+    raw_id_fields = ("event",)
+    # The model's start_datetime ordering is only indexed per event.
+    ordering = ("-id",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,88 @@
+"""
+A user's personal agenda: the schedule rows of every event they attend, as
+one timeline in (start_datetime, id) order.
+
+Pages are keyset-paginated. The cursor carries the position of the last row
+sent and the latest end time seen so far, so a session that starts before an
+earlier one has ended is flagged `overlaps` even across page boundaries.
+Each event's sessions are read in order from the (event, start_datetime)
+index, at most `limit + 1` of them, and the per-event runs are merged into
+one page (a UNION ALL of the runs ordered as a whole, which PostgreSQL
+executes as a merge). A page never sorts more than the events' next rows.
+"""
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+from .models import Event, EventReaction, EventSchedule
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(start, pk, max_end):
+    payload = {"start": start.isoformat(), "id": pk, "max_end": max_end.isoformat() if max_end else None}
+    return urlsafe_base64_encode(json.dumps(payload, separators=(",", ":")).encode())
+
+
+def decode_cursor(cursor):
+    try:
+        payload = json.loads(force_str(urlsafe_base64_decode(cursor)))
+        start = parse_datetime(payload["start"])
+        max_end = parse_datetime(payload["max_end"]) if payload["max_end"] else None
+        pk = int(payload["id"])
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor("Invalid cursor.")
+    if start is None:
+        raise InvalidCursor("Invalid cursor.")
+    return start, pk, max_end
+
+
+def agenda_page(user, cursor=None, limit=DEFAULT_LIMIT):
+    """
+    Return (schedules, next_cursor), each schedule annotated with `overlaps`;
+    next_cursor is None on the last page. Raises InvalidCursor.
+    """
+    after = Q()
+    max_end = None
+    if cursor:
+        start, pk, max_end = decode_cursor(cursor)
+        # Written as a range on start_datetime so each run stays an index scan.
+        after = Q(start_datetime__gte=start) & ~Q(start_datetime=start, id__lte=pk)
+
+    events = {
+        event.pk: event
+        for event in Event.objects.filter(
+            reactions__user=user, reactions__status=EventReaction.ATTENDING
+        ).only("id", "title")
+    }
+    if not events:
+        return [], None
+    runs = [
+        EventSchedule.objects.filter(after, event_id=event_id).order_by("start_datetime", "id")[: limit + 1]
+        for event_id in events
+    ]
+    if len(runs) == 1:
+        schedules = runs[0]
+    else:
+        schedules = runs[0].union(*runs[1:], all=True).order_by("start_datetime", "id")[: limit + 1]
+
+    rows = []
+    for schedule in schedules.iterator():
+        if len(rows) == limit:
+            last = rows[-1]
+            return rows, encode_cursor(last.start_datetime, last.pk, max_end)
+        schedule.event = events[schedule.event_id]
+        schedule.overlaps = max_end is not None and schedule.start_datetime < max_end
+        rows.append(schedule)
+        end = schedule.end_datetime or schedule.start_datetime
+        if max_end is None or end > max_end:
+            max_end = end
+    return rows, None
@@ -0,0 +1,63 @@
+"""
+Process-local read-through cache of event categories.
+
+The whole table is kept in each worker's memory and tagged with a version
+token held in the shared cache. Every read compares the two (one cache get,
+no query); a category write replaces the token on commit, so every worker
+reloads on its next read. The token is read before the table is loaded, so
+a write that lands mid-load just causes one more reload.
+
+Rows are kept as plain values and callers get fresh instances, never objects
+shared between threads.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import EventCategory
+
+VERSION_KEY = "events:categories:version"
+
+FIELDS = [f.attname for f in EventCategory._meta.concrete_fields]
+
+# (version, {pk: values}); replaced as a whole, so readers never see a mix.
+_snapshot = (None, {})
+
+
+def invalidate():
+    """Make every worker reload categories once the current transaction commits."""
+    transaction.on_commit(lambda: cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None))
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Cache cleared or first start: agree on a new token.
+        cache.add(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _rows():
+    global _snapshot
+    version = _current_version()
+    cached_version, rows = _snapshot
+    if version is None or version != cached_version:
+        rows = {values[0]: values for values in EventCategory.objects.order_by("pk").values_list(*FIELDS)}
+        _snapshot = (version, rows)
+    return rows
+
+
+def _build(values):
+    return EventCategory.from_db(EventCategory.objects.db, FIELDS, values)
+
+
+def all_categories():
+    return [_build(values) for values in _rows().values()]
+
+
+def get_category(pk):
+    """Return the category with this primary key, or None."""
+    values = _rows().get(pk)
+    return _build(values) if values is not None else None
@@ -0,0 +1,153 @@
+"""
+Change notifications for attendees and interested users.
+
+EventViewSet.perform_update snapshots the tracked fields before saving and,
+if any of them changed, upserts the event's pending EventChangeJob in the same
+transaction. The request does nothing else; the send_event_changes worker
+later compares the snapshot with the event's current state and queues emails
+to its audience in chunks, keeping a user id cursor on the job so a crashed
+run resumes without repeating a chunk.
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from .models import Event, EventReaction, EventChangeJob
+
+TRACKED_FIELDS = ("status", "start_time", "end_time", "venue")
+# Edits within this long of each other are delivered as one notification.
+COALESCE_DELAY = timedelta(minutes=2)
+CHUNK_SIZE = 1000
+# A running job whose heartbeat is older than this is assumed dead and resumed.
+JOB_LEASE = timedelta(minutes=5)
+
+
+def snapshot(event):
+    """Tracked fields in a JSON-friendly form, for storing and comparing."""
+    values = {}
+    for field in TRACKED_FIELDS:
+        value = getattr(event, field)
+        if isinstance(value, datetime):
+            # Normalised so the same instant compares equal whatever offset it came in with.
+            value = value.astimezone(timezone.utc).isoformat()
+        values[field] = value
+    return values
+
+
+def record_change(event, previous):
+    """
+    Queue (or postpone) the event's notification if a tracked field changed.
+    `previous` is the snapshot taken before the edit. Must run in the edit's
+    transaction.
+    """
+    if snapshot(event) == previous:
+        return
+
+    current = now()
+    table = connection.ops.quote_name(EventChangeJob._meta.db_table)
+    with connection.cursor() as cursor:
+        # An existing pending job keeps its original snapshot; only delivery moves.
+        cursor.execute(
+            f"""
+            INSERT INTO {table}
+                ("event_id", "previous", "status", "deliver_after",
+                 "last_user_id", "sent", "error", "created_at", "updated_at")
+            VALUES (%s, %s, 'pending', %s, 0, 0, '', %s, %s)
+            ON CONFLICT ("event_id") WHERE "status" = 'pending'
+            DO UPDATE SET "deliver_after" = EXCLUDED."deliver_after",
+                          "updated_at" = EXCLUDED."updated_at"
+            """,
+            [event.pk, json.dumps(previous), current + COALESCE_DELAY, current, current],
+        )
+
+
+def describe(event, previous):
+    """Human-readable lines for the changes attendees care about."""
+    current = snapshot(event)
+    lines = []
+    if current["status"] != previous["status"]:
+        if current["status"] == "cancelled":
+            lines.append(f"{event.title} has been cancelled.")
+        elif previous["status"] == "cancelled":
+            lines.append(f"{event.title} is back on.")
+    if current["start_time"] != previous["start_time"] or current["end_time"] != previous["end_time"]:
+        lines.append(
+            f"It now runs from {event.start_time:%Y-%m-%d %H:%M} to {event.end_time:%Y-%m-%d %H:%M %Z}."
+        )
+    if current["venue"] != previous["venue"]:
+        lines.append(f"The venue is now {event.venue or 'to be announced'}.")
+    return lines
+
+
+def _notification(event, lines, email, first_name):
+    return EmailMessage(
+        subject=f"Update: {event.title}",
+        body=f"Hi {first_name},\n\n" + "\n".join(lines) + "\n\nEventPilot",
+        to=[email],
+    )
+
+
+def _send_chunk(job, event, lines, chunk):
+    with transaction.atomic():
+        messages = [_notification(event, lines, email, first_name) for _, email, first_name in chunk]
+        # The default backend is the outbox, so the emails commit with the cursor.
+        get_connection().send_messages(messages)
+        job.last_user_id = chunk[-1][0]
+        job.sent += len(messages)
+        job.save(update_fields=["last_user_id", "sent", "updated_at"])
+
+
+def run_job(job, chunk_size=CHUNK_SIZE):
+    """Deliver one job chunk by chunk; returns it marked done."""
+    event = Event.objects.filter(pk=job.event_id).first()
+    lines = describe(event, job.previous) if event else []
+
+    try:
+        if lines:
+            audience = (
+                EventReaction.objects.filter(event=event, user__is_active=True, user_id__gt=job.last_user_id)
+                .order_by("user_id")
+                .values_list("user_id", "user__email", "user__first_name")
+                .iterator(chunk_size=chunk_size)
+            )
+            chunk = []
+            for row in audience:
+                chunk.append(row)
+                if len(chunk) == chunk_size:
+                    _send_chunk(job, event, lines, chunk)
+                    chunk = []
+            if chunk:
+                _send_chunk(job, event, lines, chunk)
+    except Exception as exc:
+        job.status = "failed"
+        job.error = str(exc)
+        job.save(update_fields=["status", "error", "updated_at"])
+        raise
+
+    job.status = "done"
+    job.save(update_fields=["status", "updated_at"])
+    return job
+
+
+def claim_next_job():
+    """Lock and return the next due (or abandoned) job, or None."""
+    current = now()
+    with transaction.atomic():
+        job = (
+            EventChangeJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status="pending", deliver_after__lte=current)
+                | Q(status="running", updated_at__lt=current - JOB_LEASE)
+            )
+            .order_by("deliver_after")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = "running"
+        job.save(update_fields=["status", "updated_at"])
+    return job
@@ -0,0 +1,122 @@
+"""
+Per-day event counts for the calendar's month view.
+
+One grouped query expands every event overlapping the range into the days it
+spans (generate_series, PostgreSQL) and counts them, optionally broken down
+by category or status. The `start_time` predicate is a plain range so the
+start_time indexes apply: events are looked for from MAX_SPAN_DAYS before
+the range, which bounds how long an event may run and still be counted on
+days before its start month.
+
+Results are cached per (range, filters) under a version number that every
+event write bumps, so no entry outlives the data it was built from.
+"""
+import hashlib
+import json
+import random
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Event
+
+VERSION_KEY = "events:calendar:version"
+CACHE_TTL = 10 * 60
+MAX_RANGE_DAYS = 92
+MAX_SPAN_DAYS = 90
+
+GROUP_COLUMNS = {"category": "category_id", "status": "status"}
+
+COUNTS_SQL = """
+    SELECT day::date, {group} COUNT(*)
+    FROM ({events}) AS e
+    CROSS JOIN LATERAL generate_series(
+        date_trunc('day', GREATEST(e.start_time, %s) AT TIME ZONE %s),
+        date_trunc('day', LEAST(e.end_time, %s) AT TIME ZONE %s),
+        interval '1 day'
+    ) AS day
+    GROUP BY {group_by}
+    ORDER BY 1
+"""
+
+
+def invalidate():
+    """Retire every cached histogram once the current transaction commits."""
+    transaction.on_commit(_bump_version)
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Versions start from a random value, so entries cached under an
+        # evicted version are never served again.
+        cache.add(VERSION_KEY, random.getrandbits(62), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _bump_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        _version()
+
+
+def _cache_key(params):
+    version = _version()
+    digest = hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+    return f"events:calendar:{version}:{digest}"
+
+
+def count_by_day(start, end, category=None, status=None, group_by=None):
+    """
+    Count events on each day from `start` to `end` (dates, inclusive) in the
+    current time zone. Returns [{"date", "count"[, "breakdown"]}] for the days
+    that have events.
+    """
+    params = {"start": start, "end": end, "category": category, "status": status, "group_by": group_by}
+    key = _cache_key(params)
+    days = cache.get(key)
+    if days is None:
+        days = _query(**params)
+        cache.set(key, days, timeout=CACHE_TTL)
+    return days
+
+
+def _query(start, end, category, status, group_by):
+    tz = timezone.get_current_timezone()
+    range_start = timezone.make_aware(datetime.combine(start, time.min), tz)
+    range_end = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz)
+
+    events = Event.objects.filter(
+        start_time__gte=range_start - timedelta(days=MAX_SPAN_DAYS),
+        start_time__lt=range_end,
+        end_time__gte=range_start,
+    )
+    if category is not None:
+        events = events.filter(category_id=category)
+    if status is not None:
+        events = events.filter(status=status)
+    columns = ["start_time", "end_time"] + ([GROUP_COLUMNS[group_by]] if group_by else [])
+    events_sql, events_params = events.order_by().values(*columns).query.sql_with_params()
+
+    last_instant = range_end - timedelta(microseconds=1)
+    sql = COUNTS_SQL.format(
+        events=events_sql,
+        group=f"e.{GROUP_COLUMNS[group_by]}," if group_by else "",
+        group_by="1, 2" if group_by else "1",
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*events_params, range_start, str(tz), last_instant, str(tz)])
+        rows = cursor.fetchall()
+
+    if not group_by:
+        return [{"date": day, "count": count} for day, count in rows]
+    days = {}
+    for day, value, count in rows:
+        entry = days.setdefault(day, {"date": day, "count": 0, "breakdown": {}})
+        entry["count"] += count
+        entry["breakdown"][str(value) if value is not None else "none"] = count
+    return list(days.values())
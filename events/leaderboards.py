@@ -0,0 +1,334 @@
+"""
+Bounded top-K leaderboards kept in the shared cache.
+
+Each board tracks the best ``BOARD_SIZE`` rows for one metric together with a
+``floor``: an upper bound on the score of every entity that is *not* tracked.
+Reads of the top ``k`` rows are exact as long as the k-th tracked score is
+still >= floor; otherwise (or on a cold cache) the board is rebuilt from the
+database with a single ``ORDER BY ... LIMIT`` query.
+
+Changes are recorded in order, not applied by their writer. Each committed
+change takes the next value of the board's generation counter and is stored
+under it. Whoever then holds the board lock applies every recorded change
+the board is missing, in order, and stores the board at the last generation
+it applied. A change that finds the lock busy is left to the holder, which
+checks again after releasing it. Nobody waits for the lock. Reaction changes
+are ±1 deltas to a score, so the hot path runs no aggregate. Other changes
+re-score their entity with one query.
+
+A rebuild stores the board at the generation it read before querying, so
+changes recorded while it ran are applied on top. A change that committed
+before the query but took its generation after that read is counted twice
+until the next rebuild. That window is the time between a commit and its
+on_commit callback.
+"""
+import random
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from users.models import User
+from .models import Event, EventCategory, EventReaction
+
+# Rows tracked per board. Reads can ask for up to this many; the slack above
+# the largest K we serve keeps rebuilds rare when tracked scores drop.
+BOARD_SIZE = 20
+
+LOCK_TTL = 5
+# Recorded changes older than this are gone; a board still missing one is rebuilt.
+CHANGE_TTL = 60 * 60
+# Changes applied per pass; a board further behind than this is rebuilt instead.
+CATCH_UP_BATCH = 100
+
+# Nothing is untracked, so every row that qualifies is on the board.
+NO_FLOOR = -1
+
+
+class Leaderboard:
+    def __init__(self, name, queryset, score, fields, positive_only=False):
+        self.name = name
+        self._queryset = queryset
+        self.score = score
+        self.fields = fields
+        self.positive_only = positive_only
+
+    @property
+    def key(self):
+        return f"leaderboard:{self.name}"
+
+    @property
+    def generation_key(self):
+        return f"{self.key}:gen"
+
+    def queryset(self):
+        qs = self._queryset()
+        if self.positive_only:
+            qs = qs.filter(**{f"{self.score}__gt": 0})
+        return qs
+
+    def values(self, qs):
+        return qs.values("id", *[f for f in self.fields if f != "id"], self.score)
+
+    def fetch_row(self, pk):
+        """Current row for one entity, or None if it no longer qualifies."""
+        return self.values(self.queryset().filter(pk=pk)).first()
+
+    def fetch_top(self):
+        qs = self.queryset().order_by(f"-{self.score}", "id")[:BOARD_SIZE]
+        return list(self.values(qs))
+
+    def sort(self, rows):
+        rows.sort(key=lambda r: (-r[self.score], r["id"]))
+
+    def output(self, row):
+        return {f: row[f] for f in (*self.fields, self.score)}
+
+
+def _attending():
+    return Q(reactions__status=EventReaction.ATTENDING)
+
+
+def _organizers():
+    # Deleted users keep their role until the purge; they mustn't rank meanwhile.
+    return User.objects.filter(role="organizer", deleted_at__isnull=True)
+
+
+# Events reached through a relation aren't filtered by Event.objects; deleted
+# ones must not score before the purge removes them.
+_LIVE = Q(organized_events__deleted_at__isnull=True)
+
+
+BOARDS = {
+    board.name: board
+    for board in [
+        Leaderboard(
+            "event_attendance",
+            lambda: Event.objects.annotate(attendee_count=Count("reactions", filter=_attending())),
+            score="attendee_count",
+            fields=("id", "title"),
+        ),
+        Leaderboard(
+            "organizer_events",
+            lambda: _organizers().annotate(
+                events_count=Count("organized_events", filter=_LIVE)
+            ),
+            score="events_count",
+            fields=("id", "first_name", "last_name"),
+        ),
+        Leaderboard(
+            "organizer_attendees",
+            lambda: _organizers().annotate(
+                attendee_count=Count(
+                    "organized_events__reactions",
+                    filter=_LIVE & Q(organized_events__reactions__status=EventReaction.ATTENDING),
+                )
+            ),
+            score="attendee_count",
+            fields=("id", "first_name", "last_name"),
+        ),
+        Leaderboard(
+            "organizer_published_events",
+            lambda: _organizers().annotate(
+                event_count=Count("organized_events", filter=_LIVE & Q(organized_events__status="published"))
+            ),
+            score="event_count",
+            fields=("id", "first_name", "last_name", "email"),
+            positive_only=True,
+        ),
+        Leaderboard(
+            "category_published_events",
+            lambda: EventCategory.objects.annotate(
+                event_count=Count(
+                    "events", filter=Q(events__status="published", events__deleted_at__isnull=True)
+                )
+            ),
+            score="event_count",
+            fields=("name",),
+            positive_only=True,
+        ),
+    ]
+}
+
+ORGANIZER_BOARDS = ("organizer_events", "organizer_attendees", "organizer_published_events")
+
+
+def _generation(board, cached=None):
+    generation = (cached or {}).get(board.generation_key)
+    if generation is None:
+        generation = cache.get(board.generation_key)
+    if generation is None:
+        # Counters start from a random value, so a board that outlived an
+        # evicted counter is never mistaken for current.
+        cache.add(board.generation_key, random.getrandbits(62), timeout=None)
+        generation = cache.get(board.generation_key)
+    return generation
+
+
+def _bump(board):
+    """Take the board's next generation, or None if its counter was evicted."""
+    try:
+        return cache.incr(board.generation_key)
+    except ValueError:
+        # The fresh random counter already retires whatever board is cached.
+        _generation(board)
+        return None
+
+
+def _change_key(board, generation):
+    return f"{board.key}:change:{generation}"
+
+
+def rebuild(name, generation=None):
+    board = BOARDS[name]
+    if generation is None:
+        generation = _generation(board)
+    rows = board.fetch_top()
+    floor = rows[-1][board.score] if len(rows) == BOARD_SIZE else NO_FLOOR
+    state = {"rows": rows, "floor": floor, "generation": generation}
+    cache.set(board.key, state, timeout=None)
+    return state
+
+
+def rebuild_all():
+    for name in BOARDS:
+        rebuild(name)
+
+
+def _is_exact(board, state, k):
+    rows = state["rows"]
+    if len(rows) < k:
+        return state["floor"] == NO_FLOOR
+    return rows[k - 1][board.score] >= state["floor"]
+
+
+def top(name, k):
+    """Return the best ``k`` rows (k <= BOARD_SIZE) for a board, highest first."""
+    board = BOARDS[name]
+    cached = cache.get_many([board.key, board.generation_key])
+    generation = _generation(board, cached)
+    state = cached.get(board.key)
+    busy = False
+    if state is not None and state["generation"] != generation:
+        state, generation, busy = _catch_up(board)
+    usable = state is not None and (
+        state["generation"] == generation
+        # Behind only by changes another caller is applying right now.
+        or (busy and 0 < generation - state["generation"] <= CATCH_UP_BATCH)
+    )
+    if not usable or not _is_exact(board, state, k):
+        state = rebuild(name, generation)
+    return [board.output(row) for row in state["rows"][:k]]
+
+
+def _catch_up(board):
+    """
+    Apply the recorded changes the board is missing. Returns (state,
+    generation, busy): state is None if there is no usable board, and busy
+    means another caller holds the lock and will apply the rest.
+    """
+    lock_key = f"{board.key}:lock"
+    while True:
+        if not cache.add(lock_key, 1, timeout=LOCK_TTL):
+            state = cache.get(board.key)
+            return state, _generation(board), True
+        try:
+            state, applied = _apply_pending(board)
+        finally:
+            cache.delete(lock_key)
+        generation = _generation(board)
+        # A change recorded while we held the lock left itself to us.
+        if not applied or state is None or state["generation"] >= generation:
+            return state, generation, False
+
+
+def _apply_pending(board):
+    """Under the board lock: returns (state, number of changes applied)."""
+    state = cache.get(board.key)
+    generation = _generation(board)
+    if state is None or state["generation"] >= generation:
+        # Current, or from before an evicted counter (then rebuilt on read).
+        return (state if state is not None and state["generation"] == generation else None), 0
+
+    first = state["generation"] + 1
+    last = min(generation, state["generation"] + CATCH_UP_BATCH)
+    keys = [_change_key(board, g) for g in range(first, last + 1)]
+    changes = cache.get_many(keys)
+    rows, floor, applied = list(state["rows"]), state["floor"], state["generation"]
+    for key in keys:
+        change = changes.get(key)
+        if change is None:
+            # Still being recorded (its writer will catch up) or expired.
+            break
+        if change[0] == "retire":
+            cache.delete(board.key)
+            return None, applied - state["generation"] + 1
+        rows, floor = _apply(board, rows, floor, change)
+        applied += 1
+    if applied == state["generation"]:
+        return state, 0
+    state = {"rows": rows, "floor": floor, "generation": applied}
+    cache.set(board.key, state, timeout=None)
+    return state, applied - first + 1
+
+
+def _apply(board, rows, floor, change):
+    kind, pk, amount = change
+    current = next((r for r in rows if r["id"] == pk), None)
+    rows = [r for r in rows if r["id"] != pk]
+    row = None
+    if kind == "rescore":
+        row = board.fetch_row(pk)
+    elif kind == "delta":
+        if current is not None:
+            row = {**current, board.score: current[board.score] + amount}
+        elif floor == NO_FLOOR:
+            # Every qualifying row is tracked, so this one is new to the board.
+            row = board.fetch_row(pk)
+        elif amount > 0:
+            # Untracked, so it scored at most floor and now at most floor + amount.
+            floor += amount
+    if row is not None and not (board.positive_only and row[board.score] <= 0):
+        rows.append(row)
+    board.sort(rows)
+
+    if len(rows) > BOARD_SIZE:
+        floor = max(floor, rows[BOARD_SIZE][board.score])
+        rows = rows[:BOARD_SIZE]
+    return rows, floor
+
+
+def _record(name, change):
+    board = BOARDS[name]
+    generation = _bump(board)
+    if generation is None:
+        return
+    cache.set(_change_key(board, generation), change, timeout=CHANGE_TTL)
+    _catch_up(board)
+
+
+def invalidate(*names):
+    """
+    Retire boards after bulk writes that bypass signals, once the current
+    transaction commits; they rebuild on next read.
+    """
+    names = list(names or BOARDS)
+    transaction.on_commit(lambda: [_record(name, ("retire", None, 0)) for name in names])
+
+
+def record_change(name, pk):
+    """Re-score one entity on a board once the current transaction commits."""
+    if pk is not None:
+        transaction.on_commit(lambda: _record(name, ("rescore", pk, 0)))
+
+
+def record_delta(name, pk, amount):
+    """Add `amount` to one entity's score once the current transaction commits."""
+    if pk is not None and amount:
+        transaction.on_commit(lambda: _record(name, ("delta", pk, amount)))
+
+
+def discard(name, pk):
+    """Remove an entity that can no longer qualify, without querying it."""
+    if pk is not None:
+        transaction.on_commit(lambda: _record(name, ("discard", pk, 0)))
@@ -0,0 +1,149 @@
+"""
+Live attendee/interested counts pushed to browsers over Server-Sent Events.
+
+``publish()`` hands a payload to the configured broker (``LIVE_BROKER``). The
+broker delivers it to every process running the ASGI app, where the hub for
+each event loop fans it out to that loop's subscribers. ``LocalBroker`` only
+reaches the current process; a cross-process broker (e.g. Redis pub/sub) has
+the same shape: ``publish(event_id, payload)`` sends, and incoming messages
+are passed to the ``on_message`` callback it was created with, from any
+thread.
+
+Updates are coalesced per event: a hot event emits at most
+``LIVE_UPDATES_PER_SECOND`` messages, each carrying the latest counts, and a
+slow subscriber only ever holds the newest payload.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class LocalBroker:
+    """Delivers messages within this process only (one worker, or development)."""
+
+    def __init__(self, on_message):
+        self.on_message = on_message
+
+    def publish(self, event_id, payload):
+        self.on_message(event_id, payload)
+
+
+class Subscription:
+    """One client's view of an event: the newest payload not yet sent."""
+
+    def __init__(self):
+        self._ready = asyncio.Event()
+        self._latest = None
+
+    def offer(self, payload):
+        self._latest = payload
+        self._ready.set()
+
+    async def get(self, timeout):
+        """Wait for the next payload; raises TimeoutError after `timeout` seconds."""
+        await asyncio.wait_for(self._ready.wait(), timeout)
+        self._ready.clear()
+        return self._latest
+
+
+class Hub:
+    """Subscribers of a single event loop. Only touched from that loop's thread."""
+
+    def __init__(self, loop, max_rate):
+        self.loop = loop
+        self.interval = 1 / max_rate
+        self._subscribers = defaultdict(set)
+        self._pending = {}
+        self._scheduled = set()
+        self._last_flush = {}
+
+    def __bool__(self):
+        return bool(self._subscribers)
+
+    def subscribe(self, event_id):
+        subscription = Subscription()
+        self._subscribers[event_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, event_id, subscription):
+        subscribers = self._subscribers.get(event_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[event_id]
+            self._pending.pop(event_id, None)
+            self._last_flush.pop(event_id, None)
+
+    def receive(self, event_id, payload):
+        if event_id not in self._subscribers:
+            return
+        self._pending[event_id] = payload
+        if event_id in self._scheduled:
+            return
+        self._scheduled.add(event_id)
+        next_flush = self._last_flush.get(event_id, float("-inf")) + self.interval
+        self.loop.call_later(max(0, next_flush - self.loop.time()), self._flush, event_id)
+
+    def _flush(self, event_id):
+        self._scheduled.discard(event_id)
+        payload = self._pending.pop(event_id, None)
+        if payload is None:
+            return
+        self._last_flush[event_id] = self.loop.time()
+        for subscription in self._subscribers.get(event_id, ()):
+            subscription.offer(payload)
+
+
+_hubs = {}
+_hubs_lock = threading.Lock()
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def _dispatch(event_id, payload):
+    """Broker callback; may run on any thread."""
+    with _hubs_lock:
+        hubs = list(_hubs.values())
+    for hub in hubs:
+        if not hub.loop.is_closed():
+            hub.loop.call_soon_threadsafe(hub.receive, event_id, payload)
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.LIVE_BROKER)(on_message=_dispatch)
+    return _broker
+
+
+def publish(event_id, payload):
+    """Send a payload to everyone watching the event, in every process."""
+    get_broker().publish(event_id, payload)
+
+
+def subscribe(event_id):
+    """Register the current task for updates; must be called from a coroutine."""
+    loop = asyncio.get_running_loop()
+    get_broker()
+    with _hubs_lock:
+        hub = _hubs.get(loop)
+        if hub is None:
+            hub = _hubs[loop] = Hub(loop, settings.LIVE_UPDATES_PER_SECOND)
+    return hub.subscribe(event_id)
+
+
+def unsubscribe(event_id, subscription):
+    loop = asyncio.get_running_loop()
+    with _hubs_lock:
+        hub = _hubs.get(loop)
+        if hub is None:
+            return
+        hub.unsubscribe(event_id, subscription)
+        if not hub:
+            del _hubs[loop]
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import resource
+import statistics
+import time
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+
+from events import live
+from events.models import Event
+
+
+class _Client:
+    """A fake browser: one ASGI request that stays open until told to leave."""
+
+    def __init__(self, app, path):
+        self.app = app
+        self.path = path
+        self.leave = asyncio.Event()
+        self.status = None
+        self.requested = False
+        self.messages = 0
+        self.lags = []
+        self._buffer = ""
+
+    async def receive(self):
+        if not self.requested:
+            self.requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.leave.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            return
+        self._buffer += message.get("body", b"").decode()
+        while "\n\n" in self._buffer:
+            frame, self._buffer = self._buffer.split("\n\n", 1)
+            for line in frame.splitlines():
+                if line.startswith("data: "):
+                    payload = json.loads(line[6:])
+                    self.messages += 1
+                    if "sent_at" in payload:
+                        self.lags.append(time.time() - payload["sent_at"])
+
+    async def run(self):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"127.0.0.1"), (b"accept", b"text/event-stream")],
+            "client": ("127.0.0.1", 0),
+            "server": ("127.0.0.1", 80),
+        }
+        await self.app(scope, self.receive, self.send)
+
+
+class Command(BaseCommand):
+    help = "Drive the ASGI app in-process with many SSE subscribers on one event and a stream of updates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--event", type=int, help="Event id to watch (default: the latest event).")
+        parser.add_argument("--subscribers", type=int, default=2000)
+        parser.add_argument("--rate", type=float, default=200.0, help="Updates published per second.")
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds to publish for.")
+
+    def handle(self, *args, **options):
+        event = (
+            Event.objects.filter(pk=options["event"]).first()
+            if options["event"]
+            else Event.objects.order_by("-id").first()
+        )
+        if event is None:
+            raise CommandError("No event to subscribe to; create one or pass --event.")
+        asyncio.run(self.run(event.pk, options))
+
+    def _publish(self, event_id, rate, duration):
+        # Runs in a thread, like `react` in a sync worker.
+        deadline = time.monotonic() + duration
+        sequence = 0
+        while time.monotonic() < deadline:
+            sequence += 1
+            live.publish(event_id, {"event": event_id, "attending_count": sequence, "sent_at": time.time()})
+            time.sleep(1 / rate)
+        return sequence
+
+    async def run(self, event_id, options):
+        app = get_asgi_application()
+        clients = [_Client(app, f"/api/events/{event_id}/live/") for _ in range(options["subscribers"])]
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(client.run()) for client in clients]
+        while sum(client.messages for client in clients) < len(clients):
+            await asyncio.sleep(0.05)
+        connected = time.perf_counter() - started
+        baseline = sum(client.messages for client in clients)
+
+        published = await asyncio.get_running_loop().run_in_executor(
+            None, self._publish, event_id, options["rate"], options["duration"]
+        )
+        await asyncio.sleep(1 / settings.LIVE_UPDATES_PER_SECOND + 0.2)
+
+        for client in clients:
+            client.leave.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        delivered = sum(client.messages for client in clients) - baseline
+        lags = sorted(lag for client in clients for lag in client.lags)
+        per_client = delivered / len(clients) / options["duration"]
+        statuses = {client.status for client in clients}
+        rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+        self.stdout.write(f"{len(clients)} subscribers connected in {connected:.2f}s (statuses: {statuses})")
+        self.stdout.write(f"published {published} updates in {options['duration']:.1f}s")
+        self.stdout.write(
+            f"delivered {delivered} messages, {per_client:.2f}/s per subscriber "
+            f"(limit {settings.LIVE_UPDATES_PER_SECOND:g}/s)"
+        )
+        if lags:
+            self.stdout.write(
+                f"publish-to-client lag: p50 {statistics.median(lags) * 1000:.1f} ms, "
+                f"p99 {lags[int(len(lags) * 0.99) - 1] * 1000:.1f} ms"
+            )
+        self.stdout.write(f"peak RSS {rss_mb:.0f} MB")
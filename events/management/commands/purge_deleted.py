@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from events import purge
+
+
+class Command(BaseCommand):
+    help = "Purge soft-deleted users and events in batches (resumes jobs abandoned by a crashed worker)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new jobs.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --loop.")
+        parser.add_argument(
+            "--batch-size", type=int, default=purge.BATCH_SIZE, help="Rows deleted per transaction."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            job = purge.claim_next_job()
+            if job is None:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+                continue
+
+            self.stdout.write(f"Purging {job.target} {job.target_id} (job {job.pk}, step {job.step})")
+            try:
+                purge.run_job(job, batch_size=options["batch_size"])
+            except Exception as exc:
+                self.stderr.write(f"Job {job.pk} failed: {exc}")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Job {job.pk} done: {job.rows_deleted} rows deleted"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from events import leaderboards
+
+
+class Command(BaseCommand):
+    help = "Rebuild the cached top-K leaderboards from the database (cold start)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("boards", nargs="*", help="Boards to rebuild (default: all).")
+
+    def handle(self, *args, **options):
+        names = options["boards"] or list(leaderboards.BOARDS)
+        unknown = set(names) - set(leaderboards.BOARDS)
+        if unknown:
+            raise CommandError(f"Unknown leaderboard(s): {', '.join(sorted(unknown))}")
+
+        for name in names:
+            leaderboards.rebuild(name)
+            self.stdout.write(f"Rebuilt {name}")
+        self.stdout.write(self.style.SUCCESS(f"{len(names)} leaderboard(s) rebuilt."))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from events import changes
+
+
+class Command(BaseCommand):
+    help = "Notify attendees and interested users about event changes (resumes jobs abandoned by a crashed worker)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new jobs.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --loop.")
+        parser.add_argument("--chunk-size", type=int, default=changes.CHUNK_SIZE, help="Recipients per transaction.")
+
+    def handle(self, *args, **options):
+        while True:
+            job = changes.claim_next_job()
+            if job is None:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+                continue
+
+            self.stdout.write(f"Running job {job.pk} (event {job.event_id})")
+            try:
+                changes.run_job(job, chunk_size=options["chunk_size"])
+            except Exception as exc:
+                self.stderr.write(f"Job {job.pk} failed: {exc}")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Job {job.pk} done: {job.sent} notifications"))
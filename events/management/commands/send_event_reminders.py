@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from events import reminders
+
+
+class Command(BaseCommand):
+    help = "Queue reminder emails for attendees of events starting within the given windows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window", action="append", dest="windows",
+            help=f"Reminder window such as 24h, 90m or 2d; repeatable (default: {', '.join(reminders.DEFAULT_WINDOWS)}).",
+        )
+        parser.add_argument("--chunk-size", type=int, default=reminders.CHUNK_SIZE, help="Attendees per transaction.")
+        parser.add_argument("--loop", action="store_true", help="Keep checking for due reminders.")
+        parser.add_argument("--interval", type=float, default=60.0, help="Seconds between checks with --loop.")
+
+    def handle(self, *args, **options):
+        windows = options["windows"] or reminders.DEFAULT_WINDOWS
+        for label in windows:
+            try:
+                reminders.parse_window(label)
+            except ValueError as exc:
+                raise CommandError(str(exc))
+
+        while True:
+            for label, event, queued in reminders.dispatch_due(windows, options["chunk_size"]):
+                self.stdout.write(f"{label}: queued {queued} reminders for event {event.pk} ({event.title})")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
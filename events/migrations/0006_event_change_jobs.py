@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 03:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_reminders'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventChangeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('previous', models.JSONField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('deliver_after', models.DateTimeField()),
+                ('last_user_id', models.BigIntegerField(default=0)),
+                ('sent', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='change_jobs', to='events.event')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'deliver_after'], name='events_even_status_9ea9c4_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('event',), name='unique_pending_event_change_job')],
+            },
+        ),
+    ]
@@ -0,0 +1,115 @@
+# Generated by Django 5.2.4 on 2026-10-19 03:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Every insert/update of an event (and every tombstone) takes the next value
+# of one sequence, so clients can sync with "changes since <seq>". Events that
+# are soft-deleted, or deleted while still live, leave a tombstone.
+CREATE_CHANGE_FEED = """
+CREATE SEQUENCE events_change_seq;
+
+UPDATE events_event e
+SET change_seq = ordered.seq, changed_at = e.updated_at
+FROM (SELECT id, row_number() OVER (ORDER BY updated_at, id) AS seq FROM events_event) ordered
+WHERE e.id = ordered.id;
+
+INSERT INTO events_eventtombstone (event_id, deleted_at, change_seq, changed_at)
+SELECT id, deleted_at, 0, deleted_at FROM events_event WHERE deleted_at IS NOT NULL;
+
+UPDATE events_eventtombstone t
+SET change_seq = (SELECT COUNT(*) FROM events_event) + ordered.seq
+FROM (SELECT id, row_number() OVER (ORDER BY deleted_at, id) AS seq FROM events_eventtombstone) ordered
+WHERE t.id = ordered.id;
+
+SELECT setval('events_change_seq', (SELECT COUNT(*) FROM events_event) + (SELECT COUNT(*) FROM events_eventtombstone) + 1, false);
+
+CREATE FUNCTION events_stamp_change() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.change_seq := nextval('events_change_seq');
+    NEW.changed_at := clock_timestamp();
+    RETURN NEW;
+END $$;
+
+CREATE FUNCTION events_write_tombstone() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO events_eventtombstone (event_id, deleted_at, change_seq)
+    VALUES (OLD.id, CASE WHEN TG_OP = 'DELETE' THEN clock_timestamp() ELSE NEW.deleted_at END, 0)
+    ON CONFLICT (event_id) DO NOTHING;
+    RETURN NULL;
+END $$;
+
+CREATE TRIGGER events_event_insert_stamp BEFORE INSERT ON events_event
+    FOR EACH ROW EXECUTE FUNCTION events_stamp_change();
+CREATE TRIGGER events_event_update_stamp BEFORE UPDATE ON events_event
+    FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*) EXECUTE FUNCTION events_stamp_change();
+CREATE TRIGGER events_eventtombstone_insert_stamp BEFORE INSERT ON events_eventtombstone
+    FOR EACH ROW EXECUTE FUNCTION events_stamp_change();
+CREATE TRIGGER events_event_soft_delete AFTER UPDATE OF deleted_at ON events_event
+    FOR EACH ROW WHEN (OLD.deleted_at IS NULL AND NEW.deleted_at IS NOT NULL)
+    EXECUTE FUNCTION events_write_tombstone();
+CREATE TRIGGER events_event_delete AFTER DELETE ON events_event
+    FOR EACH ROW WHEN (OLD.deleted_at IS NULL) EXECUTE FUNCTION events_write_tombstone();
+"""
+
+DROP_CHANGE_FEED = """
+DROP TRIGGER events_event_delete ON events_event;
+DROP TRIGGER events_event_soft_delete ON events_event;
+DROP TRIGGER events_eventtombstone_insert_stamp ON events_eventtombstone;
+DROP TRIGGER events_event_update_stamp ON events_event;
+DROP TRIGGER events_event_insert_stamp ON events_event;
+DROP FUNCTION events_write_tombstone();
+DROP FUNCTION events_stamp_change();
+DROP SEQUENCE events_change_seq;
+"""
+
+
+def create_change_feed(apps, schema_editor):
+    # Triggers are PostgreSQL only; elsewhere change_seq stays 0 and the feed is empty.
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_CHANGE_FEED)
+
+
+def drop_change_feed(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_CHANGE_FEED)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_change_jobs'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.BigIntegerField(unique=True)),
+                ('deleted_at', models.DateTimeField()),
+                ('change_seq', models.BigIntegerField(default=0, editable=False)),
+                ('changed_at', models.DateTimeField(blank=True, editable=False, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='change_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='changed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['change_seq'], name='events_even_change__b65ed5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventtombstone',
+            index=models.Index(fields=['change_seq'], name='events_even_change__a3a470_idx'),
+        ),
+        migrations.RunPython(create_change_feed, drop_change_feed),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-19 09:12
+
+from django.db import migrations
+
+# A writer takes its transaction id before its sequence value, so while it
+# runs, pg_stat_activity shows it (with backend_xid set) to the change feed,
+# which then holds back every change stamped after that transaction began.
+STAMP_AFTER_XID = """
+CREATE OR REPLACE FUNCTION events_stamp_change() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_current_xact_id();
+    NEW.change_seq := nextval('events_change_seq');
+    NEW.changed_at := clock_timestamp();
+    RETURN NEW;
+END $$;
+"""
+
+STAMP = """
+CREATE OR REPLACE FUNCTION events_stamp_change() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.change_seq := nextval('events_change_seq');
+    NEW.changed_at := clock_timestamp();
+    RETURN NEW;
+END $$;
+"""
+
+
+def stamp_after_xid(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(STAMP_AFTER_XID)
+
+
+def stamp(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(STAMP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_event_start_time_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(stamp_after_xid, stamp),
+    ]
@@ -11,6 +11,13 @@ class EventCategory(models.Model):
         return self.name
 
 
+class EventManager(models.Manager):
+    """Hides events that were deleted but not yet purged."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Event(models.Model):
     VISIBILITY_CHOICES = (
         ('public', 'Public'),
@@ -55,6 +62,15 @@ class Event(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set when the event is deleted; the row and its dependents are purged in the background.
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    # Position in the delta-sync feed (events.sync); stamped by a database
+    # trigger on every insert and update, whichever code path writes the row.
+    change_seq = models.BigIntegerField(default=0, editable=False)
+    changed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = EventManager()
+    all_objects = models.Manager()
 
     def is_full(self):
         attending_count = self.reactions.filter(status=EventReaction.ATTENDING).count()
@@ -65,9 +81,34 @@ class Event(models.Model):
     
     class Meta:
         ordering = ["-start_time"]
+        indexes = [
+            models.Index(fields=["status", "start_time"]),
+            models.Index(fields=["start_time"]),
+            models.Index(fields=["change_seq"]),
+        ]
 
 
 
+class EventTombstone(models.Model):
+    """
+    A deleted event, kept so delta-sync clients learn to drop it. Written by a
+    database trigger when an event is soft-deleted (or deleted outright), in
+    the same sequence as Event.change_seq; outlives the purge of the event.
+    """
+    event_id = models.BigIntegerField(unique=True)
+    deleted_at = models.DateTimeField()
+    change_seq = models.BigIntegerField(default=0, editable=False)
+    changed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["change_seq"]),
+        ]
+
+    def __str__(self):
+        return f"event #{self.event_id} deleted"
+
+
 class EventReaction(models.Model):
     INTERESTED = "interested"
     ATTENDING  = "attending"
@@ -83,6 +124,14 @@ class EventReaction(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The status as stored, so signals can tell what a save changed.
+        if "status" in field_names:
+            instance._stored_status = instance.status
+        return instance
+
     class Meta:
         unique_together = ("user", "event")
         indexes = [
@@ -115,4 +164,118 @@ class EventSchedule(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.event.title} — {self.start_datetime.isoformat()} — {self.title}"
\ No newline at end of file
+        return f"{self.event.title} — {self.start_datetime.isoformat()} — {self.title}"
+
+
+class DeletionJob(models.Model):
+    """
+    Background purge of a soft-deleted user or event and everything that
+    references it. `step` indexes the purge plan, so a crashed job resumes
+    at the step it was on; every step is idempotent.
+    """
+    TARGET_CHOICES = (
+        ('user', 'User'),
+        ('event', 'Event'),
+    )
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    target = models.CharField(max_length=10, choices=TARGET_CHOICES)
+    target_id = models.BigIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    step = models.PositiveIntegerField(default=0)
+    rows_deleted = models.PositiveBigIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("target", "target_id")
+        indexes = [
+            models.Index(fields=["status", "updated_at"]),
+        ]
+
+    def __str__(self):
+        return f"purge {self.target} #{self.target_id} [{self.status}]"
+
+
+class ReminderDispatch(models.Model):
+    """
+    Progress of one reminder window for one event. Attendees are processed in
+    user id order, so `last_user_id` lets an interrupted run pick up where it
+    stopped; `completed_at` lets later runs skip the event entirely.
+    """
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='reminder_dispatches')
+    window = models.CharField(max_length=10)
+    last_user_id = models.BigIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("event", "window")
+
+    def __str__(self):
+        return f"{self.window} reminders for {self.event_id}"
+
+
+class EventReminder(models.Model):
+    """One reminder sent to one attendee; the unique key stops duplicates across runs."""
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='reminders')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='event_reminders')
+    window = models.CharField(max_length=10)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("event", "user", "window")
+
+    def __str__(self):
+        return f"{self.window} reminder: {self.user_id} -> {self.event_id}"
+
+
+class EventChangeJob(models.Model):
+    """
+    Notifies an event's audience about significant edits. `previous` holds the
+    tracked fields as they were before the first edit; later edits while the
+    job is still pending only push `deliver_after` back, so a burst of edits
+    produces one notification that compares `previous` with the final state.
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='change_jobs')
+    previous = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    deliver_after = models.DateTimeField()
+    last_user_id = models.BigIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event'],
+                condition=models.Q(status='pending'),
+                name='unique_pending_event_change_job',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'deliver_after']),
+        ]
+
+    def __str__(self):
+        return f"changes to {self.event_id} [{self.status}]"
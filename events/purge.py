@@ -0,0 +1,150 @@
+"""
+Background purge of soft-deleted users and events.
+
+Deleting through the ORM loads every dependent row into memory and removes
+them in one long transaction. Instead, the API only marks the row deleted and
+queues a DeletionJob. The worker then walks a purge plan derived from the
+model graph (dependents first) and removes rows in bounded batches with raw
+DELETE ... WHERE id IN (SELECT id ... LIMIT n) statements, committing after
+every batch.
+"""
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.deletion import get_candidate_relations_to_delete
+from django.utils.timezone import now
+
+from overview.snapshot import mark_stale
+from users.authentication import invalidate_principal
+from users.models import User
+from . import day_counts, leaderboards
+from .models import Event, DeletionJob
+
+BATCH_SIZE = 1000
+# A running job whose heartbeat is older than this is assumed dead and resumed.
+JOB_LEASE = timedelta(minutes=5)
+
+TARGET_MODELS = {
+    "user": User,
+    "event": Event,
+}
+
+
+class PurgeError(Exception):
+    pass
+
+
+def build_plan(model, scope):
+    """
+    Return [(action, model, queryset, field)] steps that remove `scope` and
+    everything referencing it, deepest dependents first.
+    """
+    steps = []
+    for rel in get_candidate_relations_to_delete(model._meta):
+        field = rel.field
+        on_delete = field.remote_field.on_delete
+        if on_delete is models.DO_NOTHING:
+            continue
+
+        related_scope = rel.related_model._base_manager.filter(**{f"{field.name}__in": scope})
+        if on_delete is models.CASCADE:
+            steps.extend(build_plan(rel.related_model, related_scope))
+        elif on_delete is models.SET_NULL:
+            steps.append(("set_null", rel.related_model, related_scope, field))
+        else:
+            raise PurgeError(
+                f"{rel.related_model.__name__}.{field.name} uses {on_delete.__name__}; it can't be purged in batches."
+            )
+
+    steps.append(("delete", model, scope, None))
+    return steps
+
+
+def _run_batch(action, model, scope, field, batch_size):
+    batch = model._base_manager.filter(pk__in=scope.values("pk")[:batch_size])
+    if action == "delete":
+        return batch._raw_delete(batch.db)
+    return batch.update(**{field.attname: None})
+
+
+def run_job(job, batch_size=BATCH_SIZE):
+    """Purge one target, committing after every batch and recording the current step."""
+    model = TARGET_MODELS[job.target]
+    plan = build_plan(model, model._base_manager.filter(pk=job.target_id))
+
+    try:
+        while job.step < len(plan):
+            action, step_model, scope, field = plan[job.step]
+            with transaction.atomic():
+                affected = _run_batch(action, step_model, scope, field, batch_size)
+                if affected < batch_size:
+                    job.step += 1
+                if action == "delete":
+                    job.rows_deleted += affected
+                job.save(update_fields=["step", "rows_deleted", "updated_at"])
+    except Exception as exc:
+        job.status = "failed"
+        job.error = str(exc)
+        job.save(update_fields=["status", "error", "updated_at"])
+        raise
+
+    job.status = "done"
+    job.save(update_fields=["status", "updated_at"])
+    # Raw deletes skip signals; let the boards rebuild from what's left.
+    leaderboards.invalidate()
+    mark_stale()
+    return job
+
+
+def claim_next_job():
+    """Lock and return the next pending (or abandoned) job, or None."""
+    stale = now() - JOB_LEASE
+    with transaction.atomic():
+        job = (
+            DeletionJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status="pending") | Q(status="running", updated_at__lt=stale))
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = "running"
+        job.save(update_fields=["status", "updated_at"])
+    return job
+
+
+def _enqueue(target, ids):
+    DeletionJob.objects.bulk_create(
+        [DeletionJob(target=target, target_id=pk) for pk in ids],
+        ignore_conflicts=True,
+    )
+
+
+def mark_events_deleted(event_ids):
+    """Hide events right away and queue their purge."""
+    with transaction.atomic():
+        Event.all_objects.filter(pk__in=event_ids, deleted_at__isnull=True).update(deleted_at=now())
+        _enqueue("event", event_ids)
+    leaderboards.invalidate()
+    day_counts.invalidate()
+    mark_stale()
+
+
+def mark_users_deleted(user_ids):
+    """
+    Deactivate users, hide their events and queue their purge. The password is
+    made unusable so outstanding activation/reset tokens stop working.
+    """
+    deleted_at = now()
+    with transaction.atomic():
+        User.objects.filter(pk__in=user_ids).update(
+            deleted_at=deleted_at, is_active=False, password=make_password(None)
+        )
+        Event.all_objects.filter(organizer_id__in=user_ids, deleted_at__isnull=True).update(deleted_at=deleted_at)
+        _enqueue("user", user_ids)
+        invalidate_principal(*user_ids)
+    leaderboards.invalidate()
+    day_counts.invalidate()
+    mark_stale()
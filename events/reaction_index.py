@@ -0,0 +1,72 @@
+"""
+Per-user reaction map ({event_id: status}) in the shared cache, so
+`reaction_status` can be filled in for a page of events without a query.
+
+Each user has a generation counter next to the map, and the map records the
+generation it was built for; readers only trust a map whose generation is
+current. After a reaction change commits, its writer bumps the counter and
+then patches the map in place, but only if the map was current just before
+its own bump, i.e. it already held every earlier change. In any other
+interleaving (a concurrent react, a rebuild that read the database before
+the change committed) the map is left at an old generation and rebuilt by
+the next reader. Counters start from a random value so a map that outlived
+an evicted counter is never mistaken for current.
+"""
+import random
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import EventReaction
+
+MAP_TTL = 24 * 60 * 60
+
+
+def _keys(user_id):
+    return f"reactions:{user_id}:gen", f"reactions:{user_id}:map"
+
+
+def _generation(gen_key, cached):
+    generation = cached.get(gen_key)
+    if generation is None:
+        cache.add(gen_key, random.getrandbits(62), timeout=None)
+        generation = cache.get(gen_key)
+    return generation
+
+
+def statuses_for(user_id):
+    """Return {event_id: status} for every event the user has reacted to."""
+    gen_key, map_key = _keys(user_id)
+    cached = cache.get_many([gen_key, map_key])
+    generation = _generation(gen_key, cached)
+    entry = cached.get(map_key)
+    if entry is not None and entry[0] == generation:
+        return entry[1]
+
+    statuses = dict(EventReaction.objects.filter(user_id=user_id).values_list("event_id", "status"))
+    cache.set(map_key, (generation, statuses), timeout=MAP_TTL)
+    return statuses
+
+
+def record(user_id, event_id, status):
+    """Note a reaction change (`status` None for removed) once the transaction commits."""
+    transaction.on_commit(lambda: _apply(user_id, event_id, status))
+
+
+def _apply(user_id, event_id, status):
+    gen_key, map_key = _keys(user_id)
+    try:
+        generation = cache.incr(gen_key)
+    except ValueError:
+        # Counter evicted: a fresh random one retires whatever map is left.
+        cache.delete(map_key)
+        return
+    entry = cache.get(map_key)
+    if entry is None or entry[0] != generation - 1:
+        return
+    statuses = entry[1]
+    if status is None:
+        statuses.pop(event_id, None)
+    else:
+        statuses[event_id] = status
+    cache.set(map_key, (generation, statuses), timeout=MAP_TTL)
@@ -0,0 +1,149 @@
+"""
+Reminder emails for attendees of upcoming events.
+
+For every configured window (e.g. 24h and 1h before start) the dispatcher
+range-scans published events on (status, start_time). Attendees are streamed
+with a server-side cursor in user id order and handled in chunks. Each chunk
+claims its reminders with INSERT ... ON CONFLICT DO NOTHING RETURNING and
+queues emails for the claimed users only, in the same transaction, so
+restarts and overlapping runs never send a reminder twice.
+"""
+import re
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import Exists, F, OuterRef, Value
+from django.db.models.functions import Greatest
+from django.utils.timezone import now
+
+from .models import Event, EventReaction, EventReminder, ReminderDispatch
+
+DEFAULT_WINDOWS = ("24h", "1h")
+CHUNK_SIZE = 1000
+
+_WINDOW_UNITS = {"m": "minutes", "h": "hours", "d": "days"}
+
+
+def parse_window(label):
+    """'90m', '1h', '2d' -> timedelta."""
+    match = re.fullmatch(r"(\d+)([mhd])", label)
+    if not match:
+        raise ValueError(f"Invalid reminder window {label!r}; use e.g. 30m, 1h or 2d.")
+    return timedelta(**{_WINDOW_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def due_events(windows, current=None):
+    """
+    Yield (label, event) pairs whose reminder is due. An event is due for the
+    tightest window it falls into, so a late-published event gets the 1h
+    reminder instead of both.
+    """
+    current = current or now()
+    ordered = sorted(windows, key=parse_window)
+    lower = timedelta(0)
+    for label in ordered:
+        upper = parse_window(label)
+        done = ReminderDispatch.objects.filter(
+            event=OuterRef("pk"), window=label, completed_at__isnull=False
+        )
+        events = (
+            Event.objects.filter(
+                status="published",
+                start_time__gt=current + lower,
+                start_time__lte=current + upper,
+            )
+            .exclude(Exists(done))
+            .order_by("start_time")
+        )
+        for event in events:
+            yield label, event
+        lower = upper
+
+
+def _claim(event, label, user_ids):
+    """Insert reminder rows for the chunk and return the user ids that were new."""
+    table = connection.ops.quote_name(EventReminder._meta.db_table)
+    values = ", ".join(["(%s, %s, %s, %s)"] * len(user_ids))
+    params = []
+    created_at = now()
+    for user_id in user_ids:
+        params.extend([event.pk, user_id, label, created_at])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} ("event_id", "user_id", "window", "created_at") '
+            f"VALUES {values} ON CONFLICT DO NOTHING RETURNING \"user_id\"",
+            params,
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def _reminder(event, email, first_name):
+    return EmailMessage(
+        subject=f"Reminder: {event.title} starts soon",
+        body=(
+            f"Hi {first_name},\n\n"
+            f"{event.title} starts at {event.start_time:%Y-%m-%d %H:%M %Z}"
+            + (f" at {event.venue}" if event.venue else "")
+            + ".\n\nSee you there!\nEventPilot"
+        ),
+        to=[email],
+    )
+
+
+def _send_chunk(event, dispatch, chunk):
+    with transaction.atomic():
+        claimed = _claim(event, dispatch.window, [user_id for user_id, _, _ in chunk])
+        messages = [
+            _reminder(event, email, first_name)
+            for user_id, email, first_name in chunk
+            if user_id in claimed
+        ]
+        # The default backend is the outbox, so this commits with the claims.
+        get_connection().send_messages(messages)
+        ReminderDispatch.objects.filter(pk=dispatch.pk).update(
+            last_user_id=Greatest("last_user_id", Value(chunk[-1][0])),
+            sent=F("sent") + len(messages),
+            updated_at=now(),
+        )
+    return len(messages)
+
+
+def dispatch_event(event, label, chunk_size=CHUNK_SIZE):
+    """Send one window's reminders for an event; returns how many were queued."""
+    dispatch, _ = ReminderDispatch.objects.get_or_create(event=event, window=label)
+    if dispatch.completed_at:
+        return 0
+
+    attendees = (
+        EventReaction.objects.filter(
+            event=event,
+            status=EventReaction.ATTENDING,
+            user__is_active=True,
+            user_id__gt=dispatch.last_user_id,
+        )
+        .order_by("user_id")
+        .values_list("user_id", "user__email", "user__first_name")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    sent = 0
+    chunk = []
+    for row in attendees:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            sent += _send_chunk(event, dispatch, chunk)
+            chunk = []
+    if chunk:
+        sent += _send_chunk(event, dispatch, chunk)
+
+    ReminderDispatch.objects.filter(pk=dispatch.pk).update(completed_at=now())
+    return sent
+
+
+def dispatch_due(windows=DEFAULT_WINDOWS, chunk_size=CHUNK_SIZE):
+    """Send every due reminder. Returns [(label, event, queued), ...]."""
+    return [
+        (label, event, dispatch_event(event, label, chunk_size))
+        for label, event in due_events(windows)
+    ]
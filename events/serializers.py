@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Event, EventCategory, EventSchedule
+from . import categories, day_counts, reaction_index
 
 
 class EventCategorySerializer(serializers.ModelSerializer):
@@ -8,6 +9,22 @@ class EventCategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description']
 
 
+class CachedCategoryField(serializers.PrimaryKeyRelatedField):
+    """Resolves category ids from the in-process category cache instead of the database."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        category = categories.get_category(pk)
+        if category is None:
+            self.fail('does_not_exist', pk_value=data)
+        return category
+
+
 class EventSerializer(serializers.ModelSerializer):
     organizer_name = serializers.CharField(source='organizer.get_full_name', read_only=True)
     category = EventCategorySerializer(read_only=True)
@@ -17,7 +34,7 @@ class EventSerializer(serializers.ModelSerializer):
     interested_count = serializers.IntegerField(read_only=True)
 
     # ID field for creating/updating category
-    category_id = serializers.PrimaryKeyRelatedField(
+    category_id = CachedCategoryField(
         source='category',
         queryset=EventCategory.objects.all(),
         write_only=True,
@@ -52,11 +69,12 @@ class EventSerializer(serializers.ModelSerializer):
         if not request or not request.user.is_authenticated:
             return None
 
-        # Use only the prefetched data to avoid N+1 queries
-        if hasattr(obj, "my_reaction_list") and obj.my_reaction_list:
-            return obj.my_reaction_list[0].status
-
-        return None
+        # One cached {event_id: status} map per request (events.reaction_index);
+        # a view may pass its own as "reaction_statuses".
+        statuses = self.context.get("reaction_statuses")
+        if statuses is None:
+            statuses = self.context["reaction_statuses"] = reaction_index.statuses_for(request.user.pk)
+        return statuses.get(obj.pk)
 
 
 class EventScheduleSerializer(serializers.ModelSerializer):
@@ -75,3 +93,52 @@ class EventScheduleSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["created_at", "updated_at"]
 
+
+
+class EventOrganizerSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField(source='get_full_name')
+    organization = serializers.SerializerMethodField()
+
+    def get_organization(self, user):
+        # `profile` is select_related; a user without one gets None, not a query.
+        profile = getattr(user, 'profile', None)
+        return profile.organization if profile else None
+
+
+class EventDetailSerializer(EventSerializer):
+    """
+    Everything an event page needs in one response: the event with counts and
+    the caller's reaction, the organizer, and the schedule in order. Expects
+    `organizer__profile` selected and `schedules` prefetched.
+    """
+    organizer_info = EventOrganizerSerializer(source='organizer', read_only=True)
+    schedules = EventScheduleSerializer(many=True, read_only=True)
+
+    class Meta(EventSerializer.Meta):
+        fields = EventSerializer.Meta.fields + ['organizer_info', 'schedules']
+
+
+class AgendaItemSerializer(EventScheduleSerializer):
+    event_title = serializers.CharField(source='event.title', read_only=True)
+    # Starts before an earlier session on the agenda has ended.
+    overlaps = serializers.BooleanField(read_only=True)
+
+    class Meta(EventScheduleSerializer.Meta):
+        fields = EventScheduleSerializer.Meta.fields + ['event_title', 'overlaps']
+
+
+class CalendarQuerySerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    category = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=Event.STATUS_CHOICES, required=False)
+    group_by = serializers.ChoiceField(choices=['category', 'status'], required=False)
+
+    def validate(self, attrs):
+        days = (attrs['end'] - attrs['start']).days + 1
+        if not 1 <= days <= day_counts.MAX_RANGE_DAYS:
+            raise serializers.ValidationError(
+                f"'end' must be on or after 'start' and the range at most {day_counts.MAX_RANGE_DAYS} days."
+            )
+        return attrs
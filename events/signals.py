@@ -0,0 +1,112 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from users.models import User
+from . import categories, day_counts, leaderboards, reaction_index
+from .models import Event, EventCategory, EventReaction
+
+
+@receiver(pre_save, sender=Event)
+def remember_event_owner(sender, instance, **kwargs):
+    """Keep the previous organizer/category so both sides of a move get re-scored."""
+    instance._previous_owner = None
+    if instance.pk:
+        instance._previous_owner = (
+            Event.objects.filter(pk=instance.pk).values_list("organizer_id", "category_id").first()
+        )
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def update_event_leaderboards(sender, instance, **kwargs):
+    organizer_ids = {instance.organizer_id}
+    category_ids = {instance.category_id}
+    previous = getattr(instance, "_previous_owner", None)
+    if previous:
+        organizer_ids.add(previous[0])
+        category_ids.add(previous[1])
+
+    leaderboards.record_change("event_attendance", instance.pk)
+    for organizer_id in organizer_ids:
+        for name in leaderboards.ORGANIZER_BOARDS:
+            leaderboards.record_change(name, organizer_id)
+    for category_id in category_ids:
+        leaderboards.record_change("category_published_events", category_id)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=EventCategory)
+def invalidate_calendar_counts(sender, **kwargs):
+    day_counts.invalidate()
+
+
+@receiver(post_save, sender=EventReaction)
+def record_reaction(sender, instance, **kwargs):
+    reaction_index.record(instance.user_id, instance.event_id, instance.status)
+
+
+@receiver(post_delete, sender=EventReaction)
+def record_reaction_removed(sender, instance, **kwargs):
+    reaction_index.record(instance.user_id, instance.event_id, None)
+
+
+def _organizer_of(reaction):
+    if EventReaction.event.is_cached(reaction):
+        return reaction.event.organizer_id
+    return Event.objects.filter(pk=reaction.event_id).values_list("organizer_id", flat=True).first()
+
+
+def _record_attendance(reaction, before, after):
+    """Score the change in attendance; `before`/`after` are statuses (None for no reaction)."""
+    amount = (after == EventReaction.ATTENDING) - (before == EventReaction.ATTENDING)
+    if amount:
+        leaderboards.record_delta("event_attendance", reaction.event_id, amount)
+        leaderboards.record_delta("organizer_attendees", _organizer_of(reaction), amount)
+
+
+@receiver(post_save, sender=EventReaction)
+def update_reaction_leaderboards(sender, instance, created, **kwargs):
+    if created:
+        _record_attendance(instance, None, instance.status)
+    elif hasattr(instance, "_stored_status"):
+        _record_attendance(instance, instance._stored_status, instance.status)
+    else:
+        # Saved over a row it never loaded: the old status is unknown.
+        leaderboards.record_change("event_attendance", instance.event_id)
+        leaderboards.record_change("organizer_attendees", _organizer_of(instance))
+    instance._stored_status = instance.status
+
+
+@receiver(post_delete, sender=EventReaction)
+def remove_reaction_leaderboards(sender, instance, **kwargs):
+    _record_attendance(instance, getattr(instance, "_stored_status", instance.status), None)
+
+
+@receiver(post_save, sender=EventCategory)
+@receiver(post_delete, sender=EventCategory)
+def invalidate_category_cache(sender, **kwargs):
+    categories.invalidate()
+
+
+@receiver(post_save, sender=EventCategory)
+@receiver(post_delete, sender=EventCategory)
+def update_category_leaderboards(sender, instance, **kwargs):
+    leaderboards.record_change("category_published_events", instance.pk)
+
+
+@receiver(post_save, sender=User)
+def update_organizer_leaderboards(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not {"role", "first_name", "last_name", "email"} & set(update_fields):
+        return
+    for name in leaderboards.ORGANIZER_BOARDS:
+        if instance.role == "organizer":
+            leaderboards.record_change(name, instance.pk)
+        else:
+            leaderboards.discard(name, instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def drop_organizer_leaderboards(sender, instance, **kwargs):
+    for name in leaderboards.ORGANIZER_BOARDS:
+        leaderboards.discard(name, instance.pk)
@@ -0,0 +1,73 @@
+"""
+Delta sync of the event catalog.
+
+Every write to an event, and every tombstone of a deleted one, is stamped by
+a database trigger with the next value of one sequence (`change_seq`). A
+client keeps the highest sequence it has applied as its cursor and asks for
+what came after it; a cursor of 0 walks the whole catalog.
+
+Sequence values are taken when a row is written but become visible when its
+transaction commits, so a slow transaction can commit a value below one a
+client has already passed. A change is therefore held back, along with
+everything after it, while a transaction that began before it was stamped is
+still writing: that transaction may hold a lower value. No change is skipped
+however long its transaction takes; in exchange, one long-running writing
+transaction in the database delays the feed until it ends. Writers show up in
+pg_stat_activity, so the feed must connect as the same role as the writers
+(or one with pg_read_all_stats).
+"""
+from django.db import connection
+from django.utils import timezone
+
+from .models import Event, EventTombstone
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+
+def changes_since(cursor, limit=DEFAULT_LIMIT):
+    """
+    Return (changes, cursor, has_more). Each change is (seq, op, event_id) with
+    op "upsert" or "delete", in sequence order.
+    """
+    # Read before the rows, so any writer that commits in between is visible.
+    oldest_writer = _oldest_writer_start()
+    upserts = (
+        Event.objects.filter(change_seq__gt=cursor)
+        .order_by("change_seq")
+        .values_list("change_seq", "pk", "changed_at")[: limit + 1]
+    )
+    deletes = (
+        EventTombstone.objects.filter(change_seq__gt=cursor)
+        .order_by("change_seq")
+        .values_list("change_seq", "event_id", "changed_at")[: limit + 1]
+    )
+    merged = sorted(
+        [(seq, "upsert", pk, at) for seq, pk, at in upserts]
+        + [(seq, "delete", pk, at) for seq, pk, at in deletes]
+    )
+
+    changes = []
+    for seq, op, pk, changed_at in merged:
+        if changed_at is None or changed_at >= oldest_writer or len(changes) == limit:
+            break
+        changes.append((seq, op, pk))
+
+    # Held-back changes don't count: asking again right away wouldn't get them.
+    has_more = len(changes) == limit and len(merged) > limit
+    return changes, (changes[-1][0] if changes else cursor), has_more
+
+
+def _oldest_writer_start():
+    """Start of the oldest other transaction that has written anything, or now."""
+    if connection.vendor != "postgresql":
+        # No triggers, so no changes to hold back.
+        return timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT COALESCE(MIN(xact_start), clock_timestamp()) FROM pg_stat_activity
+            WHERE datname = current_database() AND backend_xid IS NOT NULL AND pid <> pg_backend_pid()
+            """
+        )
+        return cursor.fetchone()[0]
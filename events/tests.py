@@ -1,3 +1,118 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User
+from . import reaction_index
+from .models import Event, EventCategory, EventReaction, EventSchedule
+
+
+def make_event(organizer, category, title="Gig"):
+    start = timezone.now() + timedelta(days=1)
+    return Event.objects.create(
+        title=title, description="d", organizer=organizer, category=category,
+        start_time=start, end_time=start + timedelta(hours=2), venue="Hall", status="published",
+    )
+
+
+class EventFullTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.organizer = User.objects.create_user(
+            "organizer@example.com", "pw", first_name="Or", last_name="Ganizer",
+            role="organizer", is_active=True,
+        )
+        cls.event = make_event(cls.organizer, EventCategory.objects.create(name="Music"))
+        for hour in range(3):
+            EventSchedule.objects.create(
+                event=cls.event, title=f"Set {hour}",
+                start_datetime=cls.event.start_time + timedelta(hours=hour),
+            )
+        EventReaction.objects.create(event=cls.event, user=cls.organizer, status=EventReaction.ATTENDING)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizer)
+
+    def test_two_queries_with_a_warm_reaction_map(self):
+        url = f"/api/events/{self.event.pk}/full/"
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["schedules"]), 3)
+        self.assertEqual(response.data["reaction_status"], EventReaction.ATTENDING)
+
+
+class ReactionIndexTests(TransactionTestCase):
+    """The cached reaction map must never keep serving a missed change."""
+
+    def setUp(self):
+        cache.clear()
+        organizer = User.objects.create_user(
+            "organizer@example.com", "pw", first_name="Or", last_name="Ganizer",
+            role="organizer", is_active=True,
+        )
+        self.user = User.objects.create_user(
+            "member@example.com", "pw", first_name="Mem", last_name="Ber", is_active=True
+        )
+        category = EventCategory.objects.create(name="Music")
+        self.first = make_event(organizer, category, "First")
+        self.second = make_event(organizer, category, "Second")
+        EventReaction.objects.create(event=self.first, user=self.user, status=EventReaction.INTERESTED)
+
+    def react(self, event, status=EventReaction.ATTENDING):
+        EventReaction.objects.update_or_create(event=event, user=self.user, defaults={"status": status})
+
+    def test_change_applies_on_commit(self):
+        reaction_index.statuses_for(self.user.pk)
+        with transaction.atomic():
+            self.react(self.second)
+            self.assertNotIn(self.second.pk, reaction_index.statuses_for(self.user.pk))
+        self.assertEqual(reaction_index.statuses_for(self.user.pk)[self.second.pk], EventReaction.ATTENDING)
+
+    def test_react_during_rebuild(self):
+        # The rebuild reads the database, then the react commits (and patches
+        # nothing), then the rebuild stores what it read.
+        store = cache.set
+
+        def react_before_storing(key, value, *args, **kwargs):
+            if key.endswith(":map") and not self.reacted:
+                self.reacted = True
+                self.react(self.second)
+            return store(key, value, *args, **kwargs)
+
+        self.reacted = False
+        with mock.patch.object(reaction_index.cache, "set", side_effect=react_before_storing):
+            stale = reaction_index.statuses_for(self.user.pk)
+        self.assertTrue(self.reacted)
+        self.assertNotIn(self.second.pk, stale)
+
+        self.assertEqual(
+            reaction_index.statuses_for(self.user.pk),
+            {self.first.pk: EventReaction.INTERESTED, self.second.pk: EventReaction.ATTENDING},
+        )
+
+    def test_react_after_counter_eviction(self):
+        reaction_index.statuses_for(self.user.pk)
+        gen_key, _ = reaction_index._keys(self.user.pk)
+        cache.delete(gen_key)
+        self.react(self.first, EventReaction.ATTENDING)
+        self.assertEqual(reaction_index.statuses_for(self.user.pk), {self.first.pk: EventReaction.ATTENDING})
+
+    def test_map_outliving_its_counter_is_rebuilt(self):
+        reaction_index.statuses_for(self.user.pk)
+        # Written without signals, so only a rebuild can pick it up.
+        EventReaction.objects.bulk_create([
+            EventReaction(event=self.second, user=self.user, status=EventReaction.ATTENDING)
+        ])
+        gen_key, _ = reaction_index._keys(self.user.pk)
+        cache.delete(gen_key)
+        self.assertIn(self.second.pk, reaction_index.statuses_for(self.user.pk))
@@ -1,6 +1,7 @@
 from django.urls import path
 
-urlpatterns = [
+from .views import event_live
 
-   
+urlpatterns = [
+    path('<int:pk>/live/', event_live, name='event-live'),
 ]
@@ -1,16 +1,25 @@
 from rest_framework import viewsets, filters, status
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Q, Prefetch
+from django.db.models import Count, Q
 from django.db import transaction
 from django.shortcuts import get_object_or_404
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+import json
 
 from .models import Event, EventCategory, EventReaction, EventSchedule
-from .serializers import EventSerializer, EventCategorySerializer, EventScheduleSerializer
+from .serializers import (
+    AgendaItemSerializer, CalendarQuerySerializer, EventSerializer, EventDetailSerializer, EventCategorySerializer, EventScheduleSerializer,
+)
 from .filters import EventFilter
+from .purge import mark_events_deleted
+from . import agenda, categories, changes, day_counts, live, sync
+from api.throttling import UserTokenBucketThrottle, EventTokenBucketThrottle
+from api.idempotency import idempotent
 
 
 class EventCategoryViewSet(viewsets.ModelViewSet):
@@ -20,6 +29,16 @@ class EventCategoryViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'description']
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get(filters.SearchFilter.search_param):
+            return super().list(request, *args, **kwargs)
+        # Unfiltered listing comes from the in-process cache (events.categories).
+        rows = categories.all_categories()
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(rows, many=True).data)
+
     def perform_create(self, serializer):
         user = self.request.user
         if user.role not in ['organizer', 'admin'] and not user.is_staff:
@@ -42,6 +61,7 @@ class EventCategoryViewSet(viewsets.ModelViewSet):
 class EventViewSet(viewsets.ModelViewSet):
     serializer_class = EventSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    throttle_scope = None  # set per action
     filterset_class = EventFilter
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     search_fields = ['title', 'venue', 'tags']
@@ -62,20 +82,14 @@ class EventViewSet(viewsets.ModelViewSet):
                 distinct=True,
             ),
         )
-
-        # Prefetch current user's reaction
-        user = getattr(self.request, "user", None)
-        if user and user.is_authenticated:
-            qs = qs.prefetch_related(
-                Prefetch(
-                    "reactions",
-                    queryset=EventReaction.objects.filter(user=user),
-                    to_attr="my_reaction_list",
-                )
-            )
-
+        # The caller's reaction_status comes from the cached reaction map
+        # (events.reaction_index), not a per-page prefetch.
         return qs
 
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         if self.request.user.role != 'organizer' and not self.request.user.is_staff:
             raise PermissionDenied("Only organizers and staff can create events.")
@@ -85,14 +99,21 @@ class EventViewSet(viewsets.ModelViewSet):
         event = self.get_object()
         if self.request.user != event.organizer and not self.request.user.is_staff:
             raise PermissionDenied("You can only update your own events.")
-        serializer.save()
+        previous = changes.snapshot(serializer.instance)
+        with transaction.atomic():
+            event = serializer.save()
+            changes.record_change(event, previous)
 
     def perform_destroy(self, instance):
         if self.request.user != instance.organizer and not self.request.user.is_staff:
             raise PermissionDenied("You can only delete your own events.")
-        instance.delete()
+        mark_events_deleted([instance.pk])
 
-    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticatedOrReadOnly])
+    @action(
+        detail=True, methods=["post"], permission_classes=[IsAuthenticatedOrReadOnly],
+        throttle_classes=[UserTokenBucketThrottle, EventTokenBucketThrottle], throttle_scope="react",
+    )
+    @idempotent
     def react(self, request, pk=None):
         """
         POST /api/events/{id}/react/
@@ -110,33 +131,140 @@ class EventViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        # Written through instances carrying `event`, so the leaderboard
+        # signals get the organizer without a query.
         with transaction.atomic():
+            reactions = EventReaction.objects.select_for_update()
             if status_in == "none":
-                EventReaction.objects.filter(event=event, user=request.user).delete()
+                reaction = reactions.filter(event=event, user=request.user).first()
+                if reaction is not None:
+                    reaction.event = event
+                    reaction.delete()
             else:
-                EventReaction.objects.update_or_create(
-                    event=event,
-                    user=request.user,
-                    defaults={"status": status_in},
+                reaction, created = reactions.get_or_create(
+                    event=event, user=request.user, defaults={"status": status_in}
                 )
+                if not created and reaction.status != status_in:
+                    reaction.event = event
+                    reaction.status = status_in
+                    reaction.save(update_fields=["status"])
 
         # Re-fetch event so counts + reaction are fresh
         refreshed = self.get_queryset().filter(pk=event.pk).first()
-        serializer = self.get_serializer(refreshed)
+        counts = {
+            "event": refreshed.pk,
+            "attending_count": refreshed.attending_count,
+            "interested_count": refreshed.interested_count,
+        }
+        transaction.on_commit(lambda: live.publish(refreshed.pk, counts))
+        # The reaction map is only patched on commit; report the new status directly.
+        statuses = {refreshed.pk: None if status_in == "none" else status_in}
+        serializer = self.get_serializer(
+            refreshed, context={**self.get_serializer_context(), "reaction_statuses": statuses}
+        )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=["get"])
+    def full(self, request, pk=None):
+        """
+        GET /api/events/{id}/full/
+        The event page in one request: the event, its organizer and its schedule.
+        Two queries: the event (organizer, profile and category joined) and its
+        schedules; the caller's reaction comes from the cached reaction map.
+        """
+        queryset = self.get_queryset().select_related('organizer__profile').prefetch_related('schedules')
+        event = get_object_or_404(queryset, pk=pk)
+        self.check_object_permissions(request, event)
+        return Response(EventDetailSerializer(event, context=self.get_serializer_context()).data)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
+    def agenda(self, request):
+        """
+        GET /api/events/agenda/?cursor=<cursor>&limit=<n>
+        The caller's sessions across every event they attend, in start order.
+        Follow `next` for the following page.
+        """
+        try:
+            limit = int(request.query_params.get("limit", agenda.DEFAULT_LIMIT))
+        except ValueError:
+            return Response({"detail": "`limit` must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= limit <= agenda.MAX_LIMIT:
+            return Response(
+                {"detail": f"`limit` must be between 1 and {agenda.MAX_LIMIT}."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            schedules, cursor = agenda.agenda_page(request.user, request.query_params.get("cursor"), limit)
+        except agenda.InvalidCursor as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        next_url = None
+        if cursor:
+            query = request.query_params.copy()
+            query["cursor"] = cursor
+            next_url = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+        return Response({"next": next_url, "results": AgendaItemSerializer(schedules, many=True).data})
+
+    @action(detail=False, methods=["get"])
+    def calendar(self, request):
+        """
+        GET /api/events/calendar/?start=YYYY-MM-DD&end=YYYY-MM-DD
+            [&category=<id>][&status=<status>][&group_by=category|status]
+        Number of events on each day of the range; multi-day events count on
+        every day they span.
+        """
+        query = CalendarQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        days = day_counts.count_by_day(
+            params["start"], params["end"],
+            category=params.get("category"), status=params.get("status"), group_by=params.get("group_by"),
+        )
+        return Response({"start": params["start"], "end": params["end"], "days": days})
+
+    @action(detail=False, methods=["get"], url_path="changes")
+    def change_feed(self, request):
+        """
+        GET /api/events/changes/?since=<cursor>&limit=<n>
+        Events created, updated or deleted after `since` (0 for a full sync),
+        in the order they changed. Pass the returned `cursor` as the next `since`.
+        Changes appear once every transaction that began before them has
+        finished, so none is ever skipped; `has_more` means ask again now.
+        """
+        try:
+            since = int(request.query_params.get("since", 0))
+            limit = int(request.query_params.get("limit", sync.DEFAULT_LIMIT))
+        except ValueError:
+            return Response({"detail": "`since` and `limit` must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        if since < 0 or not 1 <= limit <= sync.MAX_LIMIT:
+            return Response(
+                {"detail": f"`since` must be >= 0 and `limit` between 1 and {sync.MAX_LIMIT}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        entries, cursor, has_more = sync.changes_since(since, limit)
+        upserted = [pk for _, op, pk in entries if op == "upsert"]
+        events = {event.pk: event for event in self.get_queryset().filter(pk__in=upserted)}
+        results = []
+        for seq, op, pk in entries:
+            if op == "delete":
+                results.append({"op": "delete", "seq": seq, "id": pk})
+            elif pk in events:
+                results.append({"op": "upsert", "seq": seq, "id": pk, "event": self.get_serializer(events[pk]).data})
+        return Response({"changes": results, "cursor": cursor, "has_more": has_more})
+
 
 class EventScheduleViewSet(viewsets.ModelViewSet):
     serializer_class = EventScheduleSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    throttle_scope = None  # set per action
 
     def get_queryset(self):
         event_id = self.kwargs.get("event_pk")
-        return EventSchedule.objects.filter(event_id=event_id).select_related("event")
+        # Schedules of a deleted event go with it, before the purge gets to them.
+        return EventSchedule.objects.filter(event_id=event_id, event__deleted_at__isnull=True).select_related("event")
 
     def perform_create(self, serializer):
-        event_id = self.kwargs.get("event_pk")
-        event = Event.objects.get(pk=event_id)
+        event = get_object_or_404(Event, pk=self.kwargs.get("event_pk"))
 
         user = self.request.user
         if user != event.organizer and not user.is_staff:
@@ -144,7 +272,11 @@ class EventScheduleViewSet(viewsets.ModelViewSet):
 
         serializer.save(event=event)
 
-    @action(detail=False, methods=["post"], url_path="bulk")
+    @action(
+        detail=False, methods=["post"], url_path="bulk",
+        throttle_classes=[UserTokenBucketThrottle, EventTokenBucketThrottle], throttle_scope="schedule_bulk",
+    )
+    @idempotent
     def bulk_create(self, request, event_pk=None):
         """
         Create multiple schedules in one request.
@@ -194,4 +326,54 @@ class EventScheduleViewSet(viewsets.ModelViewSet):
         if user != instance.event.organizer and not user.is_staff:
             raise PermissionDenied("You can only delete schedules for your own events.")
 
-        instance.delete()
\ No newline at end of file
+        instance.delete()
+
+
+# Seconds between keep-alive comments, so proxies don't drop idle streams.
+LIVE_KEEPALIVE = 15
+
+
+async def _live_counts(event_id):
+    counts = await EventReaction.objects.filter(event_id=event_id).aaggregate(
+        attending_count=Count("id", filter=Q(status=EventReaction.ATTENDING)),
+        interested_count=Count("id", filter=Q(status=EventReaction.INTERESTED)),
+    )
+    return {"event": event_id, **counts}
+
+
+async def _live_stream(event_id, subscription):
+    try:
+        yield "retry: 3000\n\n"
+        yield f"event: counts\ndata: {json.dumps(await _live_counts(event_id))}\n\n"
+        while True:
+            try:
+                payload = await subscription.get(timeout=LIVE_KEEPALIVE)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: counts\ndata: {json.dumps(payload)}\n\n"
+    finally:
+        live.unsubscribe(event_id, subscription)
+
+
+async def event_live(request, pk):
+    """
+    GET /api/events/{id}/live/
+    Server-Sent Events stream of the event's attending/interested counts.
+    ASGI only: under WSGI the endless stream would hold a worker until it
+    times out, so clients get 501 there and fall back to polling.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Live updates need the ASGI server; poll the event instead."},
+            status=501,
+        )
+    if not await Event.objects.filter(pk=pk).aexists():
+        raise Http404("No Event matches the given query.")
+
+    # Subscribe before reading the initial counts so no update falls in between.
+    subscription = live.subscribe(pk)
+    response = StreamingHttpResponse(_live_stream(pk, subscription), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
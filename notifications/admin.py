@@ -0,0 +1,13 @@
+from django.contrib import admin
+
+from .models import OutboxEmail
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "next_attempt_at", "sent_at", "created_at")
+    # Matches the (status, next_attempt_at) index the send_outbox worker uses.
+    list_filter = ("status",)
+    search_fields = ("subject",)
+    readonly_fields = ("created_at", "updated_at", "sent_at", "last_error")
+    ordering = ("-id",)
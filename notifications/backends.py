@@ -0,0 +1,39 @@
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .models import OutboxEmail
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """
+    Email backend that queues messages in the outbox table instead of talking
+    to SMTP. Set it as EMAIL_BACKEND and put the real transport in
+    OUTBOX_EMAIL_BACKEND; the send_outbox worker delivers the rows.
+    """
+
+    def send_messages(self, email_messages):
+        rows = []
+        for message in email_messages:
+            if not message.recipients():
+                continue
+            if message.attachments:
+                if not self.fail_silently:
+                    raise ValueError("The email outbox does not support attachments.")
+                continue
+            rows.append(
+                OutboxEmail(
+                    subject=str(message.subject),
+                    body=str(message.body),
+                    from_email=message.from_email,
+                    to=list(message.to),
+                    cc=list(message.cc),
+                    bcc=list(message.bcc),
+                    reply_to=list(message.reply_to),
+                    headers=dict(message.extra_headers),
+                    alternatives=[
+                        [str(content), mimetype]
+                        for content, mimetype in getattr(message, "alternatives", [])
+                    ],
+                )
+            )
+        OutboxEmail.objects.bulk_create(rows)
+        return len(rows)
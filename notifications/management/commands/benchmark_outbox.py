@@ -0,0 +1,134 @@
+import socketserver
+import threading
+import time
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from notifications import outbox
+from notifications.backends import OutboxEmailBackend
+from notifications.models import OutboxEmail
+
+SMTP_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# Marks the rows this command creates so it only ever touches (and deletes) those.
+BENCHMARK_HEADER = "X-Outbox-Benchmark"
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept and discard messages."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        # Stands in for the TCP/TLS/auth handshake of a real server.
+        time.sleep(self.server.connect_latency)
+        self.reply("220 sink ESMTP")
+        in_data = False
+        for line in self.rfile:
+            if in_data:
+                if line.rstrip(b"\r\n") == b".":
+                    in_data = False
+                    with self.server.lock:
+                        self.server.received += 1
+                    self.reply("250 OK")
+                continue
+            command = line[:4].upper()
+            if command == b"DATA":
+                in_data = True
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+            elif command == b"QUIT":
+                self.reply("221 Bye")
+                return
+            elif command in (b"EHLO", b"HELO", b"MAIL", b"RCPT", b"RSET", b"NOOP"):
+                self.reply("250 OK")
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _SinkServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, connect_latency):
+        super().__init__(("127.0.0.1", 0), _SinkHandler)
+        self.connect_latency = connect_latency
+        self.received = 0
+        self.lock = threading.Lock()
+
+
+def _message(i):
+    message = EmailMultiAlternatives(
+        subject=f"Activate your account #{i}",
+        body="Follow the link to activate your account.",
+        from_email="noreply@example.com",
+        to=[f"user{i}@example.com"],
+        headers={BENCHMARK_HEADER: "1"},
+    )
+    message.attach_alternative("<p>Follow the link to activate your account.</p>", "text/html")
+    return message
+
+
+class Command(BaseCommand):
+    help = "Compare per-request SMTP sends with outbox enqueue + batched delivery against a local SMTP sink."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=500, help="Emails per run.")
+        parser.add_argument("--batch-size", type=int, default=outbox.BATCH_SIZE)
+        parser.add_argument(
+            "--connect-latency", type=float, default=0.02,
+            help="Seconds the sink waits before greeting a new connection.",
+        )
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        server = _SinkServer(options["connect_latency"])
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+
+        def connection():
+            return get_connection(
+                SMTP_BACKEND, host=host, port=port, username="", password="",
+                use_tls=False, use_ssl=False, fail_silently=False,
+            )
+
+        benchmark_rows = OutboxEmail.objects.filter(headers__has_key=BENCHMARK_HEADER)
+        try:
+            # Before: every request opens its own SMTP session.
+            started = time.perf_counter()
+            for i in range(count):
+                message = _message(i)
+                message.connection = connection()
+                message.send()
+            direct = time.perf_counter() - started
+
+            # After: the request only inserts a row...
+            started = time.perf_counter()
+            for i in range(count):
+                with transaction.atomic():
+                    OutboxEmailBackend().send_messages([_message(i)])
+            enqueue = time.perf_counter() - started
+            ids = list(benchmark_rows.order_by("id").values_list("id", flat=True))
+
+            # ...and the worker delivers in batches over one session each.
+            started = time.perf_counter()
+            sent = 0
+            for offset in range(0, count, options["batch_size"]):
+                chunk = ids[offset:offset + options["batch_size"]]
+                rows = list(OutboxEmail.objects.filter(pk__in=chunk).order_by("id"))
+                sent += outbox.send_batch(rows, connection())[0]
+            deliver = time.perf_counter() - started
+        finally:
+            server.shutdown()
+            server.server_close()
+            benchmark_rows.delete()
+
+        self.stdout.write(f"Sink received {server.received} messages ({sent} via outbox)")
+        self.stdout.write(
+            f"direct SMTP per request: {direct:.2f}s  ({count / direct:.0f} msg/s, {direct / count * 1000:.2f} ms/request)"
+        )
+        self.stdout.write(
+            f"outbox enqueue per request: {enqueue:.2f}s  ({enqueue / count * 1000:.2f} ms/request)"
+        )
+        self.stdout.write(f"outbox batched delivery: {deliver:.2f}s  ({count / deliver:.0f} msg/s)")
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications import outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails over one reused connection per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new emails.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --loop.")
+        parser.add_argument("--batch-size", type=int, default=outbox.BATCH_SIZE, help="Emails claimed per batch.")
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = outbox.drain(options["batch_size"])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent} emails, {failed} failed")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,141 @@
+"""
+Delivery of queued outbox emails.
+
+The worker claims a batch of due rows, sends them over a single connection to
+the real backend (OUTBOX_EMAIL_BACKEND) and records the outcome of every row
+in one bulk update. Failed sends are retried with exponential backoff until
+MAX_ATTEMPTS; permanent SMTP rejections (5xx) fail straight away.
+"""
+import random
+import smtplib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from .models import OutboxEmail
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 6
+# Retry delays grow as RETRY_BASE * 2**(attempt - 1), capped at RETRY_MAX.
+RETRY_BASE = timedelta(seconds=30)
+RETRY_MAX = timedelta(hours=1)
+# Rows left in "sending" longer than this belong to a dead worker and are retried.
+SEND_LEASE = timedelta(minutes=10)
+
+
+def outbox_connection(**kwargs):
+    """A connection to the transport the outbox delivers through."""
+    return get_connection(settings.OUTBOX_EMAIL_BACKEND, fail_silently=False, **kwargs)
+
+
+def claim_batch(limit=BATCH_SIZE):
+    """Lock and mark as sending up to `limit` due emails, oldest first."""
+    current = now()
+    with transaction.atomic():
+        rows = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status="pending", next_attempt_at__lte=current)
+                | Q(status="sending", updated_at__lt=current - SEND_LEASE)
+            )
+            .order_by("next_attempt_at", "id")[:limit]
+        )
+        if rows:
+            OutboxEmail.objects.filter(pk__in=[row.pk for row in rows]).update(
+                status="sending", updated_at=current
+            )
+            for row in rows:
+                row.status = "sending"
+    return rows
+
+
+def to_message(row, connection):
+    message = EmailMultiAlternatives(
+        subject=row.subject,
+        body=row.body,
+        from_email=row.from_email,
+        to=row.to,
+        cc=row.cc,
+        bcc=row.bcc,
+        reply_to=row.reply_to,
+        headers=row.headers,
+        connection=connection,
+    )
+    for content, mimetype in row.alternatives:
+        message.attach_alternative(content, mimetype)
+    return message
+
+
+def _is_permanent(exc):
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500
+
+
+def _record_failure(row, exc, current):
+    row.attempts += 1
+    row.last_error = f"{type(exc).__name__}: {exc}"
+    if row.attempts >= MAX_ATTEMPTS or _is_permanent(exc):
+        row.status = "failed"
+        return
+    delay = min(RETRY_MAX, RETRY_BASE * 2 ** (row.attempts - 1))
+    row.status = "pending"
+    # Jitter keeps a burst of failures from retrying in lockstep.
+    row.next_attempt_at = current + delay * random.uniform(0.5, 1.0)
+
+
+def send_batch(rows, connection=None):
+    """
+    Send claimed rows over one connection and store the results. Returns
+    (sent, failed) counts, where failed includes rows scheduled for retry.
+    """
+    connection = connection or outbox_connection()
+    sent = failed = 0
+    current = now()
+    try:
+        connection.open()
+        for row in rows:
+            try:
+                connection.send_messages([to_message(row, connection)])
+            except Exception as exc:
+                _record_failure(row, exc, current)
+                failed += 1
+                # The session may be unusable after an error; start a fresh one.
+                connection.close()
+                connection.open()
+            else:
+                row.status = "sent"
+                row.sent_at = now()
+                row.attempts += 1
+                row.last_error = ""
+                sent += 1
+    except Exception as exc:
+        # The transport is down: everything not handled yet is retried later.
+        for row in rows:
+            if row.status == "sending":
+                _record_failure(row, exc, current)
+                failed += 1
+    finally:
+        connection.close()
+        for row in rows:
+            row.updated_at = now()
+        OutboxEmail.objects.bulk_update(
+            rows, ["status", "attempts", "next_attempt_at", "last_error", "sent_at", "updated_at"]
+        )
+    return sent, failed
+
+
+def drain(batch_size=BATCH_SIZE, connection=None):
+    """Deliver due emails batch by batch until none are left."""
+    sent = failed = 0
+    while True:
+        rows = claim_batch(batch_size)
+        if not rows:
+            return sent, failed
+        batch_sent, batch_failed = send_batch(rows, connection)
+        sent += batch_sent
+        failed += batch_failed
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class OverviewConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'overview'
+
+    def ready(self):
+        import overview.signals
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from overview.snapshot import refresh_snapshot
+
+
+class Command(BaseCommand):
+    help = "Rebuild the cached public overview snapshot (run from cron)."
+
+    def handle(self, *args, **options):
+        snapshot = refresh_snapshot()
+        self.stdout.write(self.style.SUCCESS(f"Overview snapshot rebuilt ({snapshot['etag']})."))
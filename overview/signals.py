@@ -0,0 +1,25 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from events.models import Event, EventCategory, EventReaction
+from users.models import User
+from .snapshot import mark_stale
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=EventCategory)
+@receiver(post_delete, sender=EventCategory)
+@receiver(post_save, sender=EventReaction)
+@receiver(post_delete, sender=EventReaction)
+@receiver(post_delete, sender=User)
+def overview_data_changed(sender, **kwargs):
+    mark_stale()
+
+
+@receiver(post_save, sender=User)
+def overview_user_changed(sender, instance, created, update_fields=None, **kwargs):
+    """Logins only touch last_login, which the overview doesn't show."""
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    mark_stale()
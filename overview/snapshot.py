@@ -0,0 +1,189 @@
+import hashlib
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Avg, Q, F
+from django.db.models import ExpressionWrapper, FloatField
+from django.utils.timezone import now
+from rest_framework.exceptions import APIException
+
+from events import leaderboards
+from events.models import Event, EventReaction
+from users.models import User
+
+
+SNAPSHOT_KEY = "overview:snapshot"
+LAST_WRITE_KEY = "overview:last-write"
+LOCK_KEY = "overview:snapshot:lock"
+
+# A snapshot is rebuilt after this many seconds even if nothing was written.
+SNAPSHOT_TTL = 5 * 60
+# Writes mark the snapshot stale, but it is never rebuilt more often than this.
+MIN_REBUILD_INTERVAL = 10
+# The lock expires on its own if the worker holding it dies mid-build.
+LOCK_TTL = 30
+# How long visitors wait for another worker's cold build before giving up with 503.
+COLD_WAIT_TIMEOUT = 5
+COLD_WAIT_INTERVAL = 0.05
+# Retry-After (seconds) of that 503.
+COLD_RETRY_AFTER = 2
+
+
+class SnapshotUnavailable(APIException):
+    """There is no snapshot yet and another worker is still building the first one."""
+    status_code = 503
+    default_detail = "The overview is being built; try again shortly."
+    default_code = "snapshot_unavailable"
+    # DRF's exception handler turns this into Retry-After.
+    wait = COLD_RETRY_AFTER
+
+
+def build_overview():
+    """Run the overview queries and return the response payload."""
+    # Stats
+    total_events = Event.objects.filter(status="published").count()
+    upcoming_events = Event.objects.filter(status="published", start_time__gte=now()).count()
+    # Deleted users, and the reactions and events of deleted events, stay out
+    # of the numbers before the purge runs.
+    registered_users = User.objects.filter(deleted_at__isnull=True).count()
+    total_attendees = EventReaction.objects.filter(
+        status=EventReaction.ATTENDING, event__deleted_at__isnull=True
+    ).count()
+
+    # Active organizers
+    active_organizers = (
+        User.objects.filter(
+            role="organizer",
+            deleted_at__isnull=True,
+            organized_events__status="published",
+            organized_events__deleted_at__isnull=True,
+        )
+        .distinct()
+        .count()
+    )
+
+    # Popular categories / featured organizers (by published event count)
+    popular_categories = leaderboards.top("category_published_events", 5)
+    featured_organizers = leaderboards.top("organizer_published_events", 3)
+
+    # Latest events
+    latest_events = (
+        Event.objects.filter(status="published")
+        .order_by("-created_at")[:5]
+        .values("id", "title", "start_time", "end_time", "venue", "capacity")
+    )
+
+    # Attendance rate & average capacity
+    capacity_stats = (
+        Event.objects.filter(status="published", capacity__gt=0)
+        .annotate(
+            attendee_count=Count("reactions", filter=Q(reactions__status=EventReaction.ATTENDING)),
+            attendance_rate=ExpressionWrapper(
+                F("attendee_count") * 1.0 / F("capacity"),
+                output_field=FloatField(),
+            ),
+        )
+        .aggregate(
+            avg_capacity=Avg("capacity"),
+            avg_attendance_rate=Avg("attendance_rate"),
+        )
+    )
+
+    return {
+        "stats": {
+            "total_events": total_events,
+            "upcoming_events": upcoming_events,
+            "registered_users": registered_users,
+            "total_attendees": total_attendees,
+            "active_organizers": active_organizers,
+            "avg_event_capacity": capacity_stats.get("avg_capacity") or 0,
+            "avg_attendance_rate": round(capacity_stats.get("avg_attendance_rate") or 0, 2),
+        },
+        "popular_categories": popular_categories,
+        "latest_events": list(latest_events),
+        "featured_organizers": featured_organizers,
+    }
+
+
+def refresh_snapshot():
+    """Rebuild the snapshot unconditionally and store it in the shared cache."""
+    started_at = time.time()
+    payload = build_overview()
+    body = json.dumps(payload, cls=DjangoJSONEncoder, sort_keys=True)
+    snapshot = {
+        "payload": payload,
+        "etag": '"%s"' % hashlib.md5(body.encode()).hexdigest(),
+        "built_at": started_at,
+    }
+    # Kept forever: a stale snapshot is still served while a fresh one is built.
+    cache.set(SNAPSHOT_KEY, snapshot, timeout=None)
+    return snapshot
+
+
+def mark_stale():
+    """Record a relevant write so the next visitor after it triggers a rebuild."""
+    cache.set(LAST_WRITE_KEY, time.time(), timeout=None)
+
+
+def _is_fresh(snapshot, last_write):
+    age = time.time() - snapshot["built_at"]
+    if age < MIN_REBUILD_INTERVAL:
+        return True
+    if last_write is not None and last_write >= snapshot["built_at"]:
+        return False
+    return age < SNAPSHOT_TTL
+
+
+def _rebuild_locked():
+    try:
+        return refresh_snapshot()
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+def get_snapshot():
+    """
+    Return the current snapshot, rebuilding it at most once across workers.
+
+    A stale snapshot is refreshed by the single visitor that wins the lock while
+    everyone else keeps serving the old copy. A cold cache makes the other
+    visitors wait briefly for the winner instead of all running the queries,
+    then raises SnapshotUnavailable (503) if the build is still running.
+    """
+    cached = cache.get_many([SNAPSHOT_KEY, LAST_WRITE_KEY])
+    snapshot = cached.get(SNAPSHOT_KEY)
+
+    if snapshot is not None:
+        if _is_fresh(snapshot, cached.get(LAST_WRITE_KEY)):
+            return snapshot
+        if cache.add(LOCK_KEY, 1, timeout=LOCK_TTL):
+            return _rebuild_locked()
+        return snapshot
+
+    if cache.add(LOCK_KEY, 1, timeout=LOCK_TTL):
+        return _rebuild_locked()
+
+    deadline = time.monotonic() + COLD_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(COLD_WAIT_INTERVAL)
+        snapshot = cache.get(SNAPSHOT_KEY)
+        if snapshot is not None:
+            return snapshot
+        # The builder died and its lock expired: one waiter takes over.
+        if cache.add(LOCK_KEY, 1, timeout=LOCK_TTL):
+            return _rebuild_locked()
+
+    # A slow build must not turn into every visitor running the queries.
+    raise SnapshotUnavailable()
+
+
+async def aget_snapshot():
+    """Async get_snapshot(): a fresh snapshot is served without leaving the event loop."""
+    cached = await cache.aget_many([SNAPSHOT_KEY, LAST_WRITE_KEY])
+    snapshot = cached.get(SNAPSHOT_KEY)
+    if snapshot is not None and _is_fresh(snapshot, cached.get(LAST_WRITE_KEY)):
+        return snapshot
+    return await sync_to_async(get_snapshot)()
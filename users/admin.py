@@ -1,5 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from api.admin import DeletedListFilter
+from api.pagination import EstimatedCountPaginator
+from events.purge import mark_users_deleted
 from .models import User, UserProfile
 
 class UserProfileInline(admin.StackedInline):
@@ -13,9 +16,12 @@ class UserAdmin(BaseUserAdmin):
     inlines = (UserProfileInline,)
 
     list_display = ("email", "first_name", "last_name", "role", "is_staff", "is_active")
-    list_filter = ("role", "is_staff", "is_active")
+    list_filter = (DeletedListFilter, "role", "is_staff", "is_active")
     search_fields = ("email", "first_name", "last_name")
     ordering = ("email",)
+    # No exact COUNT(*) on large tables (see api.pagination).
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         (None, {"fields": ("email", "password", "first_name", "last_name", "role")}),
@@ -38,4 +44,11 @@ class UserAdmin(BaseUserAdmin):
             return []
         return super().get_inline_instances(request, obj)
 
+    # Deleting soft-deletes like the API does; the purge removes the rows.
+    def delete_model(self, request, obj):
+        mark_users_deleted([obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        mark_users_deleted(list(queryset.values_list("pk", flat=True)))
+
 admin.site.register(User, UserAdmin)
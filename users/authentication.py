@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+PRINCIPAL_CACHE_TTL = 60
+# After a change the entry is pinned to a marker for a few seconds, so a request
+# that read the old row just before the change commits can't cache it again.
+REVOKED_TTL = 10
+REVOKED = "revoked"
+
+# Everything views read off request.user; other fields stay deferred and are
+# loaded from the database only if something actually touches them.
+PRINCIPAL_FIELDS = (
+    "id", "email", "first_name", "last_name",
+    "role", "is_staff", "is_superuser", "is_active",
+)
+
+
+def _key(user_id):
+    return f"principal:{user_id}"
+
+
+def _build(values):
+    names = [f.attname for f in User._meta.concrete_fields if f.attname in values]
+    return User.from_db(User.objects.db, names, [values[name] for name in names])
+
+
+def load_principal(user_id):
+    """Return a partially loaded User for `user_id`, or None if it doesn't exist."""
+    entry = cache.get(_key(user_id))
+    if isinstance(entry, dict):
+        return _build(entry)
+
+    values = User.objects.filter(pk=user_id).values(*PRINCIPAL_FIELDS).first()
+    if values is None:
+        return None
+    if entry is None:
+        cache.add(_key(user_id), values, timeout=PRINCIPAL_CACHE_TTL)
+    return _build(values)
+
+
+def invalidate_principal(*user_ids):
+    """Revoke cached principals now and again once the current transaction commits."""
+    entries = {_key(user_id): REVOKED for user_id in user_ids}
+    if not entries:
+        return
+    cache.set_many(entries, timeout=REVOKED_TTL)
+    transaction.on_commit(lambda: cache.set_many(entries, timeout=REVOKED_TTL))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user from a short-lived cache entry
+    instead of loading the full row on every request.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Needs the password hash, which we deliberately don't cache.
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = load_principal(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
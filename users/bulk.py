@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from dashboard.models import OrganizerRequest
+from dashboard.request_status import invalidate_request_status
+from events import leaderboards
+from events.purge import mark_users_deleted
+from .authentication import invalidate_principal
+from .models import User, BulkUserJob
+
+# Users touched per transaction. Each chunk runs a fixed number of queries.
+CHUNK_SIZE = 500
+# Jobs up to this size run inside the request; larger ones go to the worker.
+INLINE_LIMIT = CHUNK_SIZE
+# A running job whose heartbeat is older than this is assumed dead and resumed.
+JOB_LEASE = timedelta(minutes=5)
+
+
+def target_queryset(job):
+    """Users a job applies to. Superusers and the requesting admin are never touched."""
+    qs = User.objects.filter(is_superuser=False, deleted_at__isnull=True)
+    if job.created_by_id:
+        qs = qs.exclude(pk=job.created_by_id)
+
+    if "ids" in job.params:
+        return qs.filter(id__in=job.params["ids"])
+
+    term = job.params["search"]
+    return qs.filter(
+        Q(email__icontains=term) | Q(first_name__icontains=term) | Q(last_name__icontains=term)
+    )
+
+
+def _apply_chunk(job, ids):
+    if job.action == "set_role":
+        role = job.params["role"]
+        User.objects.filter(id__in=ids).update(role=role, is_staff=(role == "admin"))
+        if role != "organizer":
+            OrganizerRequest.objects.filter(user_id__in=ids, status="approved").update(status="rejected")
+    elif job.action == "deactivate":
+        User.objects.filter(id__in=ids).update(is_active=False)
+    elif job.action == "delete":
+        # Soft delete; the rows and their dependents are purged in the background.
+        mark_users_deleted(ids)
+
+    # Queryset updates skip model signals, so drop the caches they would have.
+    invalidate_principal(*ids)
+    invalidate_request_status(*ids)
+
+
+def run_job(job):
+    """Process a job chunk by chunk, committing progress with every chunk."""
+    qs = target_queryset(job).order_by("id")
+    try:
+        while True:
+            with transaction.atomic():
+                ids = list(qs.filter(id__gt=job.last_id).values_list("id", flat=True)[:CHUNK_SIZE])
+                if not ids:
+                    break
+                _apply_chunk(job, ids)
+                job.last_id = ids[-1]
+                job.processed += len(ids)
+                job.save(update_fields=["last_id", "processed", "updated_at"])
+    except Exception as exc:
+        job.status = "failed"
+        job.error = str(exc)
+        job.save(update_fields=["status", "error", "updated_at"])
+        raise
+    finally:
+        leaderboards.invalidate(*leaderboards.ORGANIZER_BOARDS)
+
+    job.status = "done"
+    job.save(update_fields=["status", "updated_at"])
+    return job
+
+
+def submit_job(action, params, created_by):
+    """Create a job; small ones are run immediately, large ones left to the worker."""
+    job = BulkUserJob(action=action, params=params, created_by=created_by)
+    job.total = target_queryset(job).count()
+    if job.total <= INLINE_LIMIT:
+        job.status = "running"
+        job.save()
+        return run_job(job)
+    job.save()
+    return job
+
+
+def claim_next_job():
+    """Lock and return the next pending (or abandoned) job, or None."""
+    stale = now() - JOB_LEASE
+    with transaction.atomic():
+        job = (
+            BulkUserJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status="pending") | Q(status="running", updated_at__lt=stale))
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = "running"
+        job.save(update_fields=["status", "updated_at"])
+    return job
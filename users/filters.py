@@ -0,0 +1,40 @@
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Q
+from django.db.models.functions import Greatest, Upper
+from rest_framework import filters
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter with an opt-in fuzzy mode backed by the pg_trgm GIN indexes.
+
+    `?search=jon&search_mode=trigram` matches substrings and near misses on the
+    view's search_fields and orders results by best similarity. Without
+    `search_mode` it behaves exactly like the default SearchFilter.
+    """
+    mode_param = "search_mode"
+
+    def filter_queryset(self, request, queryset, view):
+        if request.query_params.get(self.mode_param) != "trigram":
+            return super().filter_queryset(request, queryset, view)
+
+        search_fields = self.get_search_fields(view, request)
+        term = request.query_params.get(self.search_param, "").strip()
+        if not search_fields or not term:
+            return queryset
+
+        # Compare on UPPER(field) so both lookups hit the expression indexes.
+        term = term.upper()
+        aliases = {f"{field}_upper": Upper(field) for field in search_fields}
+        matches = Q()
+        for alias, field in zip(aliases, search_fields):
+            matches |= Q(**{f"{field}__icontains": term}) | Q(**{f"{alias}__trigram_similar": term})
+
+        similarities = [TrigramSimilarity(alias, term) for alias in aliases]
+        rank = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+        return (
+            queryset.alias(**aliases)
+            .filter(matches)
+            .annotate(search_rank=rank)
+            .order_by("-search_rank", "-id")
+        )
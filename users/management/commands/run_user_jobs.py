@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.bulk import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = "Process queued bulk user jobs (resumes jobs abandoned by a crashed worker)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new jobs.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+                continue
+
+            self.stdout.write(f"Running job {job.pk} ({job.action}, {job.total} users)")
+            try:
+                run_job(job)
+            except Exception as exc:
+                self.stderr.write(f"Job {job.pk} failed: {exc}")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Job {job.pk} done: {job.processed} users"))
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Collate, Upper
 from cloudinary.models import CloudinaryField
 
 
@@ -41,6 +43,8 @@ class User(AbstractUser):
     last_name = models.CharField(max_length=30, db_index=True)
     email = models.EmailField(unique=True, db_index=True)
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='attendee')
+    # Set when the account is deleted; the row and its dependents are purged in the background.
+    deleted_at = models.DateTimeField(null=True, blank=True)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name', 'last_name']
@@ -49,6 +53,17 @@ class User(AbstractUser):
 
     class Meta:
         ordering = ["-id"]
+        indexes = [
+            # pg_trgm indexes: case-insensitive substring and similarity search.
+            GinIndex(OpClass(Upper("email"), name="gin_trgm_ops"), name="users_email_trgm_idx"),
+            GinIndex(OpClass(Upper("first_name"), name="gin_trgm_ops"), name="users_first_name_trgm_idx"),
+            GinIndex(OpClass(Upper("last_name"), name="gin_trgm_ops"), name="users_last_name_trgm_idx"),
+            # "C"-collated B-trees serve LIKE 'PREFIX%' and return rows already
+            # sorted, so prefix autocomplete stops after LIMIT index entries.
+            models.Index(Collate(Upper("email"), "C"), name="users_email_prefix_idx"),
+            models.Index(Collate(Upper("first_name"), "C"), name="users_first_name_prefix_idx"),
+            models.Index(Collate(Upper("last_name"), "C"), name="users_last_name_prefix_idx"),
+        ]
 
     def __str__(self):
         return f"{self.first_name} ({self.last_name})"
@@ -66,4 +81,45 @@ class UserProfile(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"Profile of {self.user.email}"
\ No newline at end of file
+        return f"Profile of {self.user.email}"
+
+
+class BulkUserJob(models.Model):
+    """
+    An admin bulk action over many users, applied in chunks.
+    `last_id` is the keyset cursor, so a crashed job resumes where it stopped.
+    """
+    ACTION_CHOICES = (
+        ('set_role', 'Set role'),
+        ('deactivate', 'Deactivate'),
+        ('delete', 'Delete'),
+    )
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    # {"ids": [...]} or {"search": "..."}, plus action params such as {"role": ...}
+    params = models.JSONField(default=dict)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='bulk_jobs')
+
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    last_id = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.action} [{self.status}] {self.processed}/{self.total}"
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import User, UserProfile
+from .models import User, UserProfile, BulkUserJob
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -30,3 +30,25 @@ class UserSerializer(serializers.ModelSerializer):
 # Admin-only serializer to validate role changes
 class RoleUpdateSerializer(serializers.Serializer):
     role = serializers.ChoiceField(choices=User.ROLE_CHOICES)
+
+
+# Admin-only: users targeted by a bulk action, either explicit ids or a search term
+class BulkUserActionSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False, max_length=10000)
+    search = serializers.CharField(required=False, min_length=2)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('search' in attrs):
+            raise serializers.ValidationError("Provide exactly one of 'ids' or 'search'.")
+        return attrs
+
+
+class BulkRoleUpdateSerializer(BulkUserActionSerializer):
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES)
+
+
+class BulkUserJobSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = BulkUserJob
+        fields = ['id', 'action', 'status', 'params', 'total', 'processed', 'error', 'created_at', 'updated_at']
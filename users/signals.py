@@ -1,6 +1,7 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import User, UserProfile
+from .authentication import invalidate_principal
 
 
 @receiver(post_save, sender=User)
@@ -11,3 +12,12 @@ def create_user_profile_after_activation(sender, instance, created, **kwargs):
     """
     if instance.is_active and not hasattr(instance, 'profile'):
         UserProfile.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def revoke_cached_principal(sender, instance, update_fields=None, **kwargs):
+    """Role changes, activation and deletion must not be served from the auth cache."""
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_principal(instance.pk)
@@ -1,3 +1,72 @@
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from events.purge import mark_users_deleted
+from .models import User
+
+
+class PrincipalCacheRevocationTests(TestCase):
+    """A cached principal must never outlive a change to the user row."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            "member@example.com", "pw", first_name="Mem", last_name="Ber", is_active=True
+        )
+        # Creating the user pinned its entry to the revoked marker; start cold.
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"JWT {AccessToken.for_user(self.user)}")
+
+    def me(self):
+        return self.client.get("/api/users/me/")
+
+    def warm(self):
+        self.assertEqual(self.me().status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.me().status_code, 200)
+        self.assertFalse(
+            any('"users_user"' in query["sql"] for query in queries),
+            "the principal should be served from the cache",
+        )
+
+    def test_deactivation_applies_on_next_request(self):
+        self.warm()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save(update_fields=["is_active"])
+        self.assertEqual(self.me().status_code, 401)
+
+    def test_role_change_applies_on_next_request(self):
+        self.warm()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.role = "organizer"
+            self.user.save(update_fields=["role"])
+        response = self.me()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["role"], "organizer")
+
+    def test_role_change_by_admin_applies_on_next_request(self):
+        self.warm()
+        admin = User.objects.create_superuser("admin@example.com", "pw", first_name="Ad", last_name="Min")
+        admin_client = APIClient()
+        admin_client.force_authenticate(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = admin_client.patch(f"/api/users/{self.user.pk}/set_role/", {"role": "organizer"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.me().json()["role"], "organizer")
+
+    def test_deletion_applies_on_next_request(self):
+        self.warm()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertEqual(self.me().status_code, 401)
+
+    def test_soft_deletion_applies_on_next_request(self):
+        self.warm()
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_users_deleted([self.user.pk])
+        self.assertEqual(self.me().status_code, 401)
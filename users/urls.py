@@ -1,7 +1,11 @@
 from django.urls import path
-from .views import ActivateUserView
+from rest_framework.routers import DefaultRouter
+from .views import ActivateUserView, AccountViewSet
 
+router = DefaultRouter()
+router.register('users', AccountViewSet, basename='user')
 
 urlpatterns = [
     path('activate/<uidb64>/<token>/', ActivateUserView.as_view(), name='activate-user'),
+    *router.urls,
 ]
@@ -5,11 +5,26 @@ from rest_framework.decorators import action, parser_classes
 from rest_framework.parsers import MultiPartParser, FormParser
 from .models import User, UserProfile
 from .serializers import UserSerializer, UserProfileSerializer, RoleUpdateSerializer
+from .serializers import BulkUserActionSerializer, BulkRoleUpdateSerializer, BulkUserJobSerializer
+from .models import BulkUserJob
+from .bulk import submit_job
 from rest_framework.views import APIView
+from django.shortcuts import get_object_or_404
 from django.utils.http import urlsafe_base64_decode
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.encoding import force_str
-from rest_framework import filters
+from django.db import transaction
+from django.db.models.functions import Collate, Upper
+from djoser import utils as djoser_utils
+from djoser.views import UserViewSet as DjoserUserViewSet
+from .filters import TrigramSearchFilter
+from dashboard.request_status import invalidate_request_status
+from events.purge import mark_users_deleted
+
+
+AUTOCOMPLETE_MIN_LENGTH = 2
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 25
 
 
 class UserViewSet(viewsets.ReadOnlyModelViewSet):
@@ -18,10 +33,10 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     Regular users can only see their own.
     """
     # queryset = User.objects.select_related('profile').all()
-    queryset = User.objects.all()
+    queryset = User.objects.filter(deleted_at__isnull=True)
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [TrigramSearchFilter]
     search_fields = ['email', 'first_name', 'last_name']
     
 
@@ -45,6 +60,41 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     def me(self, request):
         return Response(self.get_serializer(request.user).data)
 
+    @action(detail=False, methods=["get"], permission_classes=[IsAdminUser])
+    def autocomplete(self, request):
+        """
+        Admin-only: top matches for a prefix of email, first or last name.
+        GET /api/users/autocomplete/?q=jo&limit=10
+
+        Each field is read in index order from its "C"-collated UPPER(field)
+        index and stops after `limit` rows, so cost doesn't grow with the table.
+        """
+        term = request.query_params.get("q", "").strip()
+        if len(term) < AUTOCOMPLETE_MIN_LENGTH:
+            return Response([])
+        try:
+            limit = int(request.query_params.get("limit", AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            limit = AUTOCOMPLETE_LIMIT
+        limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+
+        columns = ("id", "email", "first_name", "last_name")
+        per_field = [
+            User.objects.filter(**{f"{field}__istartswith": term})
+            .order_by(Collate(Upper(field), "C"))
+            .values_list(*columns)[:limit]
+            for field in self.search_fields
+        ]
+        rows = per_field[0].union(*per_field[1:])
+
+        # Email matches first, then name matches; alphabetical within each.
+        prefix = term.upper()
+        matches = sorted(
+            (dict(zip(columns, row)) for row in rows),
+            key=lambda u: (not u["email"].upper().startswith(prefix), u["email"].upper()),
+        )
+        return Response(matches[:limit])
+
     @action(
     detail=True,
     methods=['patch'],
@@ -63,6 +113,7 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         user.role = new_role
         if new_role != 'organizer':
             user.organizer_requests.filter(status='approved').update(status='rejected')
+            invalidate_request_status(user.id)
         user.is_staff = (new_role == 'admin')
         user.save(update_fields=['role', 'is_staff'])
 
@@ -71,6 +122,41 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(UserSerializer(user).data)
     
 
+    def _submit_bulk(self, request, action, serializer_class):
+        serializer = serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = submit_job(action, serializer.validated_data, created_by=request.user)
+
+        data = BulkUserJobSerializer(job).data
+        if job.status == 'done':
+            return Response(data)
+        # Too large to run inline: poll the job for progress.
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['post'], url_path='bulk/set-role', permission_classes=[IsAdminUser])
+    def bulk_set_role(self, request):
+        """
+        Admin-only: change the role of many users.
+        Body: {"ids": [...]} or {"search": "..."}, plus {"role": "..."}
+        """
+        return self._submit_bulk(request, 'set_role', BulkRoleUpdateSerializer)
+
+    @action(detail=False, methods=['post'], url_path='bulk/deactivate', permission_classes=[IsAdminUser])
+    def bulk_deactivate(self, request):
+        """Admin-only: deactivate many users. Body: {"ids": [...]} or {"search": "..."}"""
+        return self._submit_bulk(request, 'deactivate', BulkUserActionSerializer)
+
+    @action(detail=False, methods=['post'], url_path='bulk/delete', permission_classes=[IsAdminUser])
+    def bulk_delete(self, request):
+        """Admin-only: delete many users. Body: {"ids": [...]} or {"search": "..."}"""
+        return self._submit_bulk(request, 'delete', BulkUserActionSerializer)
+
+    @action(detail=False, methods=['get'], url_path=r'bulk/jobs/(?P<job_id>\d+)', permission_classes=[IsAdminUser])
+    def bulk_job(self, request, job_id=None):
+        """Admin-only: progress of a bulk job."""
+        job = get_object_or_404(BulkUserJob, pk=job_id)
+        return Response(BulkUserJobSerializer(job).data)
+
     def destroy(self, request, *args, **kwargs):
         """Allow only admin to delete a user (and their profile)."""
         if not request.user.is_staff and not request.user.is_superuser:
@@ -80,7 +166,7 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
             )
 
         user = self.get_object()
-        user.delete()
+        mark_users_deleted([user.pk])
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -130,13 +216,42 @@ class UserProfileViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
 
+class AccountViewSet(DjoserUserViewSet):
+    """
+    djoser's registration/account endpoints. Emails go to the outbox, so the
+    user row and its activation email commit (or roll back) together.
+    """
+
+    def perform_create(self, serializer, *args, **kwargs):
+        with transaction.atomic():
+            super().perform_create(serializer, *args, **kwargs)
+
+    def perform_update(self, serializer, *args, **kwargs):
+        with transaction.atomic():
+            super().perform_update(serializer, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        # djoser's destroy() without its logout, which perform_destroy does
+        # once the account is actually marked deleted.
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_destroy(instance)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def perform_destroy(self, instance):
+        mark_users_deleted([instance.pk])
+        if instance == self.request.user:
+            djoser_utils.logout_user(self.request)
+
+
 class ActivateUserView(APIView):
     permission_classes = []
 
     def get(self, request, uidb64, token):
         try:
             uid = force_str(urlsafe_base64_decode(uidb64))
-            user = User.objects.get(pk=uid)
+            user = User.objects.get(pk=uid, deleted_at__isnull=True)
         except (TypeError, ValueError, OverflowError, User.DoesNotExist):
             return Response({'detail': 'Invalid activation link.'}, status=status.HTTP_400_BAD_REQUEST)
 